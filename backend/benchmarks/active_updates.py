@@ -0,0 +1,126 @@
+# "Who is out in this window" over 100k historical user updates: the GiST range index behind
+# GET /api/user_updates/active vs. the (start, end) btree and vs. loading the whole table and
+# filtering in Python (what the frontend had to do before).
+# Each index variant runs in a transaction with the other index dropped, then rolled back.
+# run from backend/:
+#   python -m benchmarks.active_updates [--rows 100000] [--database-url postgresql+asyncpg://...]
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import func, insert, select, text
+
+from benchmarks.load_test import bench_database, prepare
+
+SPAN_DAYS = 5 * 365
+
+
+async def _seed_updates(engine, rows: int, users: int) -> None:
+    from src.entities.user_update import UserUpdate
+
+    rnd = random.Random(21)
+    origin = datetime.now(timezone.utc) - timedelta(days=SPAN_DAYS)
+    async with engine.begin() as conn:
+        if await conn.scalar(select(func.count()).select_from(UserUpdate)) >= rows:
+            return
+        batch: List[Dict[str, Any]] = []
+        for i in range(rows):
+            start = origin + timedelta(minutes=rnd.randrange(SPAN_DAYS * 1440))
+            batch.append({"user_t_name": f"bu{rnd.randrange(users)}", "update": "absence",
+                          "start_date_time": start, "end_date_time": start + timedelta(hours=rnd.randrange(4, 24 * 14))})
+            if len(batch) == 5000:
+                await conn.execute(insert(UserUpdate), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(UserUpdate), batch)
+        await conn.execute(text("ANALYZE user_updates"))
+
+
+def _windows(n: int) -> List[Tuple[datetime, datetime]]:
+    rnd = random.Random(5)
+    origin = datetime.now(timezone.utc) - timedelta(days=SPAN_DAYS)
+    out = []
+    for _ in range(n):
+        start = origin + timedelta(days=rnd.randrange(SPAN_DAYS))
+        out.append((start, start + timedelta(days=7)))
+    return out
+
+async def _time(conn, run: Callable, windows: List[Tuple[datetime, datetime]]) -> Dict[str, Any]:
+    rows = 0
+    times = []
+    for start, end in windows:
+        t = time.perf_counter()
+        rows += await run(conn, start, end)
+        times.append(time.perf_counter() - t)
+    times.sort()
+    return {"queries": len(times), "avg_rows": round(rows / len(times), 1),
+            "p50_ms": round(times[len(times) // 2] * 1000, 3), "p95_ms": round(times[int(len(times) * 0.95)] * 1000, 3)}
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = await prepare({"users": 200, "teams": 5, "messages": 0, "events": 0, "ideas": 0})
+    from src.entities.user_update import USER_UPDATE_PERIOD, UserUpdate
+    from src.services.unique_actions import _columns, get_active_user_updates
+
+    await _seed_updates(engine, args.rows, 200)
+    windows = _windows(args.queries)
+
+    async def gist(conn, start, end) -> int:
+        return len(await get_active_user_updates(conn, start, end, limit=5000))
+
+    async def btree(conn, start, end) -> int:
+        stmt = select(*_columns(UserUpdate)).where(UserUpdate.start_date_time < end, UserUpdate.end_date_time > start)
+        return len((await conn.execute(stmt)).all())
+
+    async def whole_table(conn, start, end) -> int:
+        rows = (await conn.execute(select(*_columns(UserUpdate)))).all()
+        return sum(1 for r in rows if r.start_date_time < end and r.end_date_time > start)
+
+    variants = [
+        ("gist_overlap", gist, "ix_user_updates_start_end"),
+        ("btree_start_end", btree, "ix_user_updates_period"),
+        ("whole_table_python_filter", whole_table, None),
+    ]
+    results = {}
+    async with engine.connect() as conn:
+        for name, fn, drop in variants:
+            trans = await conn.begin()
+            if drop:
+                await conn.execute(text(f"DROP INDEX {drop}"))
+            await _time(conn, fn, windows[:3])   # warm up
+            results[name] = await _time(conn, fn, windows if fn is not whole_table else windows[:args.queries // 10 or 1])
+            if fn is gist:
+                plan = await conn.scalar(text(
+                    "EXPLAIN (FORMAT JSON) SELECT id FROM user_updates WHERE "
+                    "tstzrange(least(start_date_time, end_date_time), greatest(start_date_time, end_date_time)) && tstzrange(now(), now() + interval '7 days')"
+                ))
+                results[name]["plan"] = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]["Node Type"]
+            await trans.rollback()
+            r = results[name]
+            print(f"{name:<28} p50 {r['p50_ms']:>9.3f} ms   p95 {r['p95_ms']:>9.3f} ms   ~{r['avg_rows']} rows", file=sys.stderr)
+    await engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time-window lookups on user_updates")
+    parser.add_argument("--database-url", help="use this (disposable) database instead of an ephemeral one")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with bench_database(args.database_url):
+        results = asyncio.run(run(args))
+    print(json.dumps({"rows": args.rows, "window_days": 7, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# Bytes on the wire for the public read endpoints, per encoding, plus the revalidation (304) cost.
+# Needs a running backend:  python -m benchmarks.bytes_on_wire [--base-url http://localhost:8000]
+from __future__ import annotations
+
+import argparse
+import urllib.error
+import urllib.request
+from typing import Dict, Tuple
+
+ENDPOINTS = ["/api/messages", "/api/forum_settings/futureForumSchedule"]
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def fetch(url: str, headers: Dict[str, str]) -> Tuple[int, int, Dict[str, str]]:
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req) as res:   # urllib does not decompress: len(body) is the wire size
+            return res.status, len(res.read()), dict(res.headers)
+    except urllib.error.HTTPError as e:            # 304 is raised as an HTTPError
+        return e.code, len(e.read()), dict(e.headers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<42} {'encoding':<9} {'status':>6} {'bytes':>9} {'saved':>7}")
+    for path in ENDPOINTS:
+        url = args.base_url + path
+        baseline = None
+        etag = None
+        for encoding in ENCODINGS:
+            status, size, headers = fetch(url, {"Accept-Encoding": encoding})
+            baseline = baseline or size
+            etag = etag or headers.get("ETag")
+            served = headers.get("Content-Encoding", "identity")
+            print(f"{path:<42} {served:<9} {status:>6} {size:>9} {1 - size / baseline:>6.0%}")
+
+        if etag:
+            status, size, _ = fetch(url, {"Accept-Encoding": "gzip", "If-None-Match": etag})
+            print(f"{path:<42} {'revalid.':<9} {status:>6} {size:>9} {1 - size / baseline:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Checks that the hot read queries get an index plan from the planner as configured, on tables
+# big enough for the choice to matter. Runs on a throwaway Postgres seeded at bench scale and
+# ANALYZEd; planner settings are left at their defaults.
+# What it can't tell you: a query that selects a large share of its table, or runs on a table with
+# fewer than MIN_ROWS rows, is served by a Seq Scan on purpose, so it is reported as "skip",
+# not checked. Exits non-zero if a selective query on a large table still gets a Seq Scan.
+# run from backend/:
+#   python -m benchmarks.explain_hot_queries [--database-url postgresql+asyncpg://...]
+# --database-url must point at a database you can throw away: it gets migrated and seeded.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import func, insert, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from benchmarks.active_updates import _seed_updates
+from benchmarks.load_test import bench_database, prepare
+
+# events: the bench seed puts all of them in the future; PAST_EVENTS adds the history a real
+# forum accumulates, so "future events" is the small share of the table it is in production
+VOLUMES = {"users": 20_000, "teams": 50, "messages": 100_000, "events": 500, "ideas": 50_000}
+USER_UPDATES = 100_000
+TEAM_LINKS = 20_000
+PAST_EVENTS = 20_000
+MIN_ROWS = 10_000      # below this a Seq Scan is cheap whatever the query
+SELECTIVE = 0.05       # a query expected to return at most this share of its table should use an index
+
+
+def hot_queries() -> List[Tuple[str, str, Any]]:
+    from src.entities.forum_event import ForumEvent
+    from src.entities.forum_idea import FORUM_IDEA_SEARCH, ForumIdea
+    from src.entities.message import MESSAGE_SEARCH, Message
+    from src.entities.team_link import TeamLink
+    from src.entities.user import BIRTHDAY_MMDD, User
+    from src.entities.user_update import USER_UPDATE_PERIOD, UserUpdate
+    from src.services.search import _tsquery
+
+    now = datetime.now(timezone.utc)
+    week_ago, next_week = now - timedelta(days=7), now + timedelta(days=7)
+    return [
+        ("teamForumIdeas", "forum_ideas", select(ForumIdea).where(ForumIdea.team_name == "bteam1").order_by(ForumIdea.id.desc())),
+        ("team links", "team_links", select(TeamLink).where(TeamLink.team_name == "bteam1")),
+        ("futureForumEvents", "forum_events", select(ForumEvent).where(ForumEvent.date_time > now).order_by(ForumEvent.date_time.asc())),
+        ("message feed page", "messages", select(Message).where(tuple_(Message.date_time, Message.id) < tuple_(now, 10**9))
+                                          .order_by(Message.date_time.desc(), Message.id.desc()).limit(50)),
+        ("user updates in window", "user_updates", select(UserUpdate).where(USER_UPDATE_PERIOD.op("&&")(func.tstzrange(week_ago, next_week)))),
+        ("search messages", "messages", select(Message.id).where(MESSAGE_SEARCH.op("@@")(_tsquery("forum")))),
+        ("search forum ideas", "forum_ideas", select(ForumIdea.id).where(FORUM_IDEA_SEARCH.op("@@")(_tsquery("forum")))),
+        ("upcoming birthdays (wraps Dec 31)", "users", select(User.t_name).where(or_(BIRTHDAY_MMDD >= 1225, BIRTHDAY_MMDD <= 107))),
+        ("upcoming releases", "users", select(User.t_name).where(User.release_date.between(now.date(), next_week.date()))),
+    ]
+
+
+async def _seed_links_and_history(engine) -> None:
+    # the tables the shared bench seed leaves empty or all-future
+    from src.entities.forum_event import ForumEvent
+    from src.entities.team_link import TeamLink
+
+    rnd = random.Random(9)
+    now = datetime.now(timezone.utc)
+    teams = [f"bteam{i}" for i in range(VOLUMES["teams"])]
+    async with engine.begin() as conn:
+        if await conn.scalar(select(func.count()).select_from(TeamLink)) >= TEAM_LINKS:
+            return   # already seeded (reused --database-url)
+        for i in range(0, TEAM_LINKS, 5000):
+            await conn.execute(insert(TeamLink), [
+                {"name": f"link {n}", "link": f"https://example.com/{n}", "team_name": rnd.choice(teams)}
+                for n in range(i, min(i + 5000, TEAM_LINKS))
+            ])
+        for i in range(0, PAST_EVENTS, 5000):
+            await conn.execute(insert(ForumEvent), [
+                {"name": f"past forum {n}", "team_name": rnd.choice(teams), "date_time": now - timedelta(days=rnd.randrange(1, 3650))}
+                for n in range(i, min(i + 5000, PAST_EVENTS))
+            ])
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def run() -> int:
+    engine = await prepare(VOLUMES)
+    await _seed_updates(engine, USER_UPDATES, VOLUMES["users"])
+    await _seed_links_and_history(engine)
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+        for label, table, stmt in hot_queries():
+            sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            raw = (await conn.execute(text("EXPLAIN (FORMAT JSON) " + sql))).scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            table_rows = await conn.scalar(text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table})
+
+            scans = [n for n in _nodes(plan) if n.get("Relation Name") == table]
+            seq = any(n["Node Type"] == "Seq Scan" for n in scans)
+            used = ", ".join(f'{n["Node Type"]} using {n.get("Index Name", "-")}' for n in scans)
+            share = plan["Plan Rows"] / table_rows if table_rows > 0 else 1.0
+            if table_rows < MIN_ROWS:
+                status, note = "skip", f"{table} has ~{table_rows:.0f} rows"
+            elif share > SELECTIVE:
+                status, note = "skip", f"expects {share:.0%} of {table}"
+            else:
+                status, note = ("FAIL" if seq else "ok"), f"expects {share:.2%} of {table}"
+            print(f"{status:<4}  {label:<34} {used}  ({note})")
+            failures += status == "FAIL"
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Index plans of the hot read queries at bench scale")
+    parser.add_argument("--database-url", help="use this (disposable) database instead of an ephemeral one")
+    args = parser.parse_args()
+    with bench_database(args.database_url):
+        return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
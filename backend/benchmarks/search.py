@@ -0,0 +1,124 @@
+# GET /api/search against the naive alternative: full-text search on the generated tsvector
+# columns (GIN) vs. ILIKE '%word%' over title and message, on 100k messages of mixed English
+# and Hebrew text. FTS is timed cold (result cache cleared before each query) and warm.
+# run from backend/:
+#   python -m benchmarks.search [--rows 100000] [--database-url postgresql+asyncpg://...]
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import func, insert, or_, select, text
+
+from benchmarks.load_test import bench_database, prepare
+
+ENGLISH = ("forum schedule meeting update release deploy server database holiday office kitchen budget "
+           "report design review planning training security network backup printer parking lunch party "
+           "onboarding customer invoice travel vacation reminder announcement workshop sprint").split()
+HEBREW = "פגישה עדכון שחרור שרת חופשה משרד מטבח תקציב דוח תכנון הדרכה אבטחה רשת גיבוי מדפסת חניה ארוחה מסיבה לקוח נסיעה תזכורת הודעה סדנה".split()
+FILLER = "the a of to and in for on with is this that we all please next week team new".split()
+
+
+def _text(rnd: random.Random, words: int) -> str:
+    out = []
+    for _ in range(words):
+        r = rnd.random()
+        pool = FILLER if r < 0.5 else ENGLISH if r < 0.8 else HEBREW
+        # skewed pick, so some words are common and some rare, like real text
+        out.append(pool[min(int(rnd.expovariate(4 / len(pool))), len(pool) - 1)])
+    return " ".join(out)
+
+async def _seed_messages(engine, rows: int, users: int) -> None:
+    from src.entities.message import Message
+
+    rnd = random.Random(23)
+    now = datetime.now(timezone.utc)
+    async with engine.begin() as conn:
+        if await conn.scalar(select(func.count()).select_from(Message)) >= rows:
+            return
+        batch: List[Dict[str, Any]] = []
+        for i in range(rows):
+            batch.append({"title": _text(rnd, rnd.randrange(3, 8)), "message": _text(rnd, rnd.randrange(20, 120)),
+                          "user_t_name": f"bu{rnd.randrange(users)}", "date_time": now - timedelta(minutes=rnd.randrange(525_600))})
+            if len(batch) == 5000:
+                await conn.execute(insert(Message), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(Message), batch)
+        await conn.execute(text("ANALYZE messages"))
+
+
+def _terms(n: int) -> List[str]:
+    rnd = random.Random(7)
+    words = ENGLISH + HEBREW
+    return [" ".join(rnd.sample(words, rnd.choice((1, 1, 2)))) for _ in range(n)]
+
+async def _time(conn, run: Callable, terms: List[str]) -> Dict[str, Any]:
+    times = []
+    for term in terms:
+        t = time.perf_counter()
+        await run(conn, term)
+        times.append(time.perf_counter() - t)
+    times.sort()
+    return {"queries": len(times), "p50_ms": round(times[len(times) // 2] * 1000, 3),
+            "p95_ms": round(times[int(len(times) * 0.95)] * 1000, 3)}
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = await prepare({"users": 200, "teams": 5, "messages": 0, "events": 0, "ideas": 0})
+    from src.entities.message import Message
+    from src.services import search
+
+    await _seed_messages(engine, args.rows, 200)
+    terms = _terms(args.queries)
+
+    async def fts_cold(conn, q) -> None:
+        search.clear_cache()
+        await search.search(conn, q, ("messages",), 20, 0)
+
+    async def fts_warm(conn, q) -> None:
+        await search.search(conn, q, ("messages",), 20, 0)
+
+    async def ilike(conn, q) -> None:
+        # every word somewhere in title or message, newest first: what a LIKE-based search would do
+        conds = [or_(Message.title.ilike(f"%{w}%"), Message.message.ilike(f"%{w}%")) for w in q.split()]
+        stmt = select(Message.id, Message.title, Message.message).where(*conds).order_by(Message.date_time.desc()).limit(20)
+        (await conn.execute(stmt)).all()
+
+    results = {}
+    async with engine.connect() as conn:
+        for name, fn in (("fts_gin_cold", fts_cold), ("fts_gin_cached", fts_warm), ("ilike_scan", ilike)):
+            await _time(conn, fn, terms[:3])   # warm up
+            results[name] = await _time(conn, fn, terms)
+            r = results[name]
+            print(f"{name:<16} p50 {r['p50_ms']:>9.3f} ms   p95 {r['p95_ms']:>9.3f} ms", file=sys.stderr)
+        plan = await conn.scalar(text(
+            "EXPLAIN (FORMAT JSON) SELECT id FROM messages "
+            "WHERE search @@ (websearch_to_tsquery('english', 'budget') || websearch_to_tsquery('simple', 'budget'))"
+        ))
+        results["fts_gin_cold"]["plan"] = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]["Node Type"]
+    await engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Full-text search vs. ILIKE on messages")
+    parser.add_argument("--database-url", help="use this (disposable) database instead of an ephemeral one")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with bench_database(args.database_url):
+        results = asyncio.run(run(args))
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
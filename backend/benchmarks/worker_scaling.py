@@ -0,0 +1,111 @@
+# Read throughput with 1, 2, 4 ... uvicorn worker processes: real sockets, keep-alive HTTP/1.1,
+# and the load generated from separate processes so the client is not the bottleneck.
+# Client and server share the machine, so expect the curve to flatten at about half the cores.
+# run from backend/:
+#   python -m benchmarks.worker_scaling                            # ephemeral Postgres, like load_test
+#   python -m benchmarks.worker_scaling --workers 1,2,4,8 --database-url postgresql+asyncpg://...
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from typing import Any, Dict, List
+
+from benchmarks.load_test import _free_port, _wait_for_port, bench_database, prepare
+
+READ_PATHS = [
+    "/api/forum_events/futureForumEvents",
+    "/api/forum_settings/futureForumSchedule",
+    "/api/forum_ideas/teamForumIdeas/bteam1",
+    "/api/messages?limit=50",
+]
+
+
+async def _connection(port: int, until: float, offset: int) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    done = 0
+    while time.time() < until:
+        path = READ_PATHS[(offset + done) % len(READ_PATHS)]
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = next(int(line.split(b":", 1)[1]) for line in head.lower().split(b"\r\n") if line.startswith(b"content-length:"))
+        await reader.readexactly(length)
+        if status != 200:
+            raise RuntimeError(f"{path} -> {status}")
+        done += 1
+    writer.close()
+    return done
+
+def _client_process(port: int, until: float, connections: int) -> int:
+    async def run() -> int:
+        return sum(await asyncio.gather(*[_connection(port, until, i) for i in range(connections)]))
+    return asyncio.run(run())
+
+def drive(port: int, duration: float, client_procs: int, connections: int) -> float:
+    until = time.time() + duration
+    with Pool(client_procs) as pool:
+        counts = pool.starmap(_client_process, [(port, until, connections)] * client_procs)
+    return sum(counts) / duration
+
+
+async def _prepare(volumes: Dict[str, int]) -> None:
+    engine = await prepare(volumes)
+    await engine.dispose()
+
+def measure(env: Dict[str, str], workers: int, args: argparse.Namespace) -> float:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env={**env, "STARTUP_DB_INIT": "skip", "WEB_CONCURRENCY": str(workers)},
+    )
+    try:
+        _wait_for_port(port)
+        drive(port, args.warmup, args.client_procs, args.connections)
+        return drive(port, args.duration, args.client_procs, args.connections)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Read throughput vs. number of uvicorn workers")
+    parser.add_argument("--database-url", help="use this (disposable) database instead of an ephemeral one")
+    parser.add_argument("--workers", type=lambda s: [int(n) for n in s.split(",")], default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--client-procs", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--connections", type=int, default=16, help="keep-alive connections per client process")
+    parser.add_argument("--out", help="write the JSON results here (default stdout)")
+    args = parser.parse_args()
+    volumes = {"users": 2000, "teams": 20, "messages": 20000, "events": 500, "ideas": 5000}
+
+    with bench_database(args.database_url):
+        asyncio.run(_prepare(volumes))
+
+        results: List[Dict[str, Any]] = []
+        for workers in args.workers:
+            rps = measure(dict(os.environ), workers, args)
+            base = results[0]["rps"] / results[0]["workers"] if results else rps / workers
+            results.append({"workers": workers, "rps": round(rps, 1), "efficiency": round(rps / (base * workers), 3)})
+            print(f"{workers:>3} workers  {rps:>9.1f} req/s  efficiency {results[-1]['efficiency']:.2f}", file=sys.stderr)
+
+    report = {"meta": {"cpus": os.cpu_count(), "client_procs": args.client_procs, "connections": args.connections,
+                       "duration_s": args.duration, "paths": READ_PATHS}, "results": results}
+    out = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
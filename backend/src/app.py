@@ -1,16 +1,21 @@
 # main.py
+import asyncio
 from datetime import date
 
 from fastapi import FastAPI
-from sqlalchemy import select
+from sqlalchemy import select, text
 from contextlib import asynccontextmanager
-from src.routers.main import main_router
+from src.routers.main import main_router, cache_policies
+from src.middleware import CompressionMiddleware, HttpCacheMiddleware, MetricsMiddleware
 
 from src.entities.base import Base
 from src.entities.user import User 
 from src.entities.forum_settings import ForumSettings 
 from src.db import AsyncSessionLocal, engine
-from src.auth.auth import hash_password
+from src.migrations import MIGRATIONS, run_migrations
+from src.services.versions import load_versions
+from src.auth.hashing import hash_password_async, shutdown_hash_pool
+from src.services.events import start_listener, stop_listener
 import os
 
 DATABASE_URL = os.getenv(
@@ -22,17 +27,46 @@ ADMIN_NAME = os.getenv("ADMIN_NAME")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 
 
+# auto: each process checks the schema at boot (two tiny queries) and only the first one to find
+#       work does it, under an advisory lock. skip: workers go straight to serving; run
+#       "python -m src.app" once per deploy (release step / init container) instead.
+STARTUP_DB_INIT = os.getenv("STARTUP_DB_INIT", "auto")
+BOOTSTRAP_LOCK_KEY = 7_310_002
+
+
+async def db_ready() -> bool:
+    """ schema at (or, during a rolling deploy, past) our latest migration and admin present """
+    async with engine.connect() as conn:
+        if await conn.scalar(text("SELECT to_regclass('schema_migrations')")) is None:
+            return False
+        version = await conn.scalar(text("SELECT max(version) FROM schema_migrations"))
+        admin = await conn.scalar(select(User.t_name).where(User.t_name == ADMIN_T_NANE))
+    return version is not None and version >= MIGRATIONS[-1][0] and admin is not None
+
 async def init_db_and_seed() -> None:
     if not all([ADMIN_T_NANE, ADMIN_NAME, ADMIN_PASSWORD]):
         raise ValueError("Admin credentials are not fully set in environment variables.")
-    
+    if await db_ready():
+        return
+
+    # session-level lock on its own connection: concurrent workers wait here, then find everything done
+    async with engine.connect() as lock_conn:
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+        try:
+            if not await db_ready():
+                await _create_and_seed()
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BOOTSTRAP_LOCK_KEY})
+
+async def _create_and_seed() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await run_migrations(engine)
 
     async with AsyncSessionLocal() as db:
         existing = await db.scalar(select(User).where(User.t_name == ADMIN_T_NANE))
         if not existing:
-            db.add(User(t_name=ADMIN_T_NANE, name=ADMIN_NAME, password_hash=hash_password(ADMIN_PASSWORD)))
+            db.add(User(t_name=ADMIN_T_NANE, name=ADMIN_NAME, password_hash=await hash_password_async(ADMIN_PASSWORD)))
 
         existing = await db.scalar(select(ForumSettings))
         if not existing:
@@ -45,27 +79,48 @@ async def init_db_and_seed() -> None:
             from src.entities.message import Message
             from src.entities.user_update import UserUpdate
             from datetime import datetime
+            idan_hash, haim_hash = await asyncio.gather(hash_password_async("idan1234"), hash_password_async("haim1234"))   # in parallel on the hash pool
             db.add(Team(name="team1", description="Team 1 Description", order=1))
             db.add(Team(name="team2", description="Team 2 Description", order=2))
             db.add(Team(name="team3", description="Team 3 Description", order=3))
             db.add(Team(name="team4", description="Team 4 Description", order=4))
-            db.add(User(t_name="t_idan", name="idan g", password_hash=hash_password("idan1234"), birthday=date(1990, 1, 1), release_date=date(2030, 1, 1), joined_date=date(2020, 1, 1)))
-            db.add(User(t_name="t_haim", name="haim n", password_hash=hash_password("haim1234"), birthday=date(1990, 1, 1), release_date=date(2030, 2, 2), joined_date=date(2020, 2, 2), team_name="team1"))
+            db.add(User(t_name="t_idan", name="idan g", password_hash=idan_hash, birthday=date(1990, 1, 1), release_date=date(2030, 1, 1), joined_date=date(2020, 1, 1)))
+            db.add(User(t_name="t_haim", name="haim n", password_hash=haim_hash, birthday=date(1990, 1, 1), release_date=date(2030, 2, 2), joined_date=date(2020, 2, 2), team_name="team1"))
             db.add(Message(title="hi1", message="hello1", user_t_name="t_haim", date_time=datetime(2024, 1, 1, 10, 0, 0)))
             db.add(Message(title="hi2", message="hello2", user_t_name="t_idan", date_time=datetime(2024, 1, 1, 11, 0, 0)))
-            db.add(UserUpdate(user_t_name="t_adam_si", update="agnash", start_date_time=datetime(2026, 1, 15, 7, 0), end_date_time=datetime(2026, 1, 22, 17, 0)))
+            db.add(UserUpdate(user_t_name="t_idan", update="agnash", start_date_time=datetime(2026, 1, 15, 7, 0), end_date_time=datetime(2026, 1, 22, 17, 0)))
             db.add(UserUpdate(user_t_name="t_haim", update="gimelim", start_date_time=datetime(2026, 1, 11, 7, 0), end_date_time=datetime(2026, 1, 13, 17, 0)))
             ##########  DELETE  #############
             ##########  DELETE  #############
             ##########  DELETE  #############
 
-        await db.commit()
+        await db.commit()   # the table_versions triggers count the seed writes like any other
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db_and_seed()
+    if STARTUP_DB_INIT != "skip":
+        await init_db_and_seed()
+    async with engine.connect() as conn:
+        await load_versions(conn)
+    start_listener()
     yield
+    await stop_listener()
+    shutdown_hash_pool()
 
 app = FastAPI(lifespan=lifespan)
 
-app.include_router(main_router)
\ No newline at end of file
+# last added runs first: compression wraps the ETag/304 layer, so ETags are computed on the plain body
+app.add_middleware(HttpCacheMiddleware, policies=cache_policies)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)   # outermost: latency includes the cache and compression work
+
+app.include_router(main_router)
+
+async def _bootstrap() -> None:
+    await init_db_and_seed()
+    shutdown_hash_pool()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    # one-off schema + seed for STARTUP_DB_INIT=skip deployments:  python -m src.app
+    asyncio.run(_bootstrap())
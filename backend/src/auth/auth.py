@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import hashlib
-import hmac
-import os
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
@@ -14,20 +11,11 @@ from src.db import get_db
 from src.entities.system_error import SystemError
 from src.entities.user import User
 from src.auth.token import mint_token
+from src.auth.hashing import hash_password_async, verify_password_async, needs_rehash, hash_pool_stats
+from src.auth.deps import require_admin
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-_ITER = int(os.getenv("PWD_ITER", "210000"))
-_SALT = os.getenv("PWD_SALT", "change-me-salt").encode("utf-8")
-
-def hash_password(password: str) -> str:
-    pw = password.encode("utf-8")
-    dk = hashlib.pbkdf2_hmac("sha256", pw, _SALT, _ITER)
-    return dk.hex()
-
-def verify_password(password: str, password_hash: str) -> bool:
-    return hmac.compare_digest(hash_password(password), password_hash)
-
 class LoginIn(BaseModel):
     t_name: str
     password: str
@@ -59,9 +47,14 @@ async def login(payload: LoginIn, db: AsyncSession = Depends(get_db)):
     if not user:
         raise SystemError(401, "User not found")
 
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         raise SystemError(401, "Bad credentials")
 
+    # parameters changed since this hash was made (or legacy format) - upgrade it while we have the password
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(password)
+        await db.commit()
+
     token = mint_token(t_name=user.t_name)
     return LoginResult(
         t_name=user.t_name,
@@ -71,3 +64,7 @@ async def login(payload: LoginIn, db: AsyncSession = Depends(get_db)):
         release_date=user.release_date,
         access_token=token,
     )
+
+@router.get("/hash_pool")
+async def hash_pool(_=Depends(require_admin)):
+    return hash_pool_stats()
@@ -6,6 +6,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from src.auth.token import verify_token
 from src.entities.system_error import SystemError
+from src.services.metrics import timed
 
 security = HTTPBearer(auto_error=False)
 
@@ -15,10 +16,14 @@ async def get_current_identity(creds: HTTPAuthorizationCredentials | None = Depe
     if not creds or not creds.credentials:
         raise SystemError(401, "Unauthorized")
 
-    payload = verify_token(creds.credentials)
+    with timed("auth"):
+        payload = verify_token(creds.credentials)
     return payload
 
+def is_admin(identity) -> bool:
+    return identity is not None and identity.get("t_name") == ADMIN_T_NANE
+
 async def require_admin(identity = Depends(get_current_identity)):
-    if identity.get("t_name") != ADMIN_T_NANE:
+    if not is_admin(identity):
         raise SystemError(403, f"Forbidden, You are not an admin")
     return identity
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.entities.system_error import SystemError
+
+ALGORITHM = "pbkdf2_sha256"
+_ITER = int(os.getenv("PWD_ITER", "210000"))  # tune per deployment with: python -m src.auth.hashing --target-ms 100
+_SALT_BYTES = 16
+
+# hashes created before the versioned format: bare hex digest with one global salt
+_LEGACY_SALT = os.getenv("PWD_SALT", "change-me-salt").encode("utf-8")
+_LEGACY_ITER = int(os.getenv("PWD_LEGACY_ITER", "210000"))
+
+POOL_KIND = os.getenv("PWD_POOL_KIND", "thread")      # thread | process
+# per worker process: by default the cores are split between the uvicorn workers (WEB_CONCURRENCY)
+_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+POOL_SIZE = int(os.getenv("PWD_POOL_SIZE", str(min(4, max(1, (os.cpu_count() or 1) // _WORKERS)))))
+MAX_PENDING = int(os.getenv("PWD_MAX_PENDING", "64"))  # logins waiting/running before we start rejecting
+
+def _b64encode(b: bytes) -> str:
+    return base64.b64encode(b).decode("ascii").rstrip("=")
+
+def _b64decode(s: str) -> bytes:
+    return base64.b64decode(s + "=" * (-len(s) % 4))
+
+def hash_password(password: str, iterations: int | None = None) -> str:
+    """ returns "pbkdf2_sha256$<iterations>$<salt>$<digest>" with a fresh random salt """
+    iterations = iterations or _ITER
+    salt = os.urandom(_SALT_BYTES)
+    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64encode(salt)}${_b64encode(dk)}"
+
+def verify_password(password: str, password_hash: str) -> bool:
+    pw = password.encode("utf-8")
+    parts = password_hash.split("$")
+    if len(parts) != 4:
+        legacy = hashlib.pbkdf2_hmac("sha256", pw, _LEGACY_SALT, _LEGACY_ITER).hex()
+        return hmac.compare_digest(legacy, password_hash)
+
+    algorithm, iterations, salt, digest = parts
+    if algorithm != ALGORITHM:
+        return False
+    try:
+        dk = hashlib.pbkdf2_hmac("sha256", pw, _b64decode(salt), int(iterations))
+        return hmac.compare_digest(dk, _b64decode(digest))
+    except ValueError:
+        return False
+
+def needs_rehash(password_hash: str) -> bool:
+    """ True for legacy hashes and hashes made with other parameters than the current ones """
+    parts = password_hash.split("$")
+    if len(parts) != 4:
+        return True
+    algorithm, iterations, _, _ = parts
+    return algorithm != ALGORITHM or iterations != str(_ITER)
+
+def calibrate_iterations(target_ms: float, probe_iterations: int = 50_000) -> int:
+    """ iterations that make one hash take about target_ms on this machine """
+    salt = os.urandom(_SALT_BYTES)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        hashlib.pbkdf2_hmac("sha256", b"calibration", salt, probe_iterations)
+        best = min(best, time.perf_counter() - start)
+    iterations = int(probe_iterations * (target_ms / 1000) / best)
+    return max(1_000, round(iterations, -3))
+
+
+# PBKDF2 takes tens of ms of pure CPU, so it never runs on the event loop.
+# hashlib releases the GIL while hashing, so threads are enough; a process pool
+# can be chosen for deployments where the GIL still shows up.
+# Logins are admitted against their own count (MAX_PENDING). Everything else (admin creates,
+# bulk imports) goes through _others, at most POOL_SIZE in the pool at a time, so a big import
+# neither counts as login load nor leaves logins queued behind hundreds of hashes.
+_executor: Executor | None = None
+_pending = 0          # all calls waiting for or running in the pool (stats)
+_pending_logins = 0
+_rejected = 0
+_others = asyncio.Semaphore(POOL_SIZE)
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        cls = ProcessPoolExecutor if POOL_KIND == "process" else ThreadPoolExecutor
+        _executor = cls(max_workers=POOL_SIZE)
+    return _executor
+
+async def _submit(fn: Callable[..., Any], *args: Any) -> Any:
+    global _pending
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _pending -= 1
+
+async def _run(fn: Callable[..., Any], *args: Any, admit: bool = False) -> Any:
+    global _pending_logins, _rejected
+    if not admit:
+        async with _others:
+            return await _submit(fn, *args)
+
+    if _pending_logins >= MAX_PENDING:
+        _rejected += 1
+        raise SystemError(503, "Too many login attempts, try again in a few seconds")
+    _pending_logins += 1
+    try:
+        return await _submit(fn, *args)
+    finally:
+        _pending_logins -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    # login path: subject to admission control so a login storm is shed instead of queued forever
+    return await _run(verify_password, password, password_hash, admit=True)
+
+def hash_pool_stats() -> Dict[str, Any]:
+    return {
+        "kind": POOL_KIND,
+        "workers": POOL_SIZE,
+        "max_pending": MAX_PENDING,
+        "pending_logins": _pending_logins,
+        "in_flight": min(_pending, POOL_SIZE),
+        "queued": max(0, _pending - POOL_SIZE),
+        "rejected": _rejected,
+    }
+
+def shutdown_hash_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick PWD_ITER for a target hash latency on this machine")
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    iterations = calibrate_iterations(args.target_ms)
+    print(f"PWD_ITER={iterations}  (~{args.target_ms:g} ms per hash, current {_ITER})")
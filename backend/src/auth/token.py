@@ -6,12 +6,21 @@ import hmac
 import json
 import os
 import time
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
 
 from src.entities.system_error import SystemError
 
 SECRET = os.getenv("AUTH_SECRET", "dev-secret-change-me")
 TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TTL_SECONDS", "86400"))
+TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+
+# keyed once; each signature is a .copy() of this instead of re-encoding SECRET
+_MAC = hmac.new(SECRET.encode("utf-8"), digestmod=hashlib.sha256)
+
+# token -> (payload, exp) for tokens whose signature was already checked.
+# Per process and safe that way: it only memoizes verification, so every worker reaches the same answer.
+_verified: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
 
 def _b64url_encode(b: bytes) -> str:
     return base64.urlsafe_b64encode(b).decode("utf-8").rstrip("=")
@@ -20,28 +29,47 @@ def _b64url_decode(s: str) -> bytes:
     pad = "=" * (-len(s) % 4)
     return base64.urlsafe_b64decode((s + pad).encode("utf-8"))
 
+def _sign(payload_s: str) -> str:
+    mac = _MAC.copy()
+    mac.update(payload_s.encode("utf-8"))
+    return _b64url_encode(mac.digest())
+
 def mint_token(*, t_name: str) -> str:
     now = int(time.time())
     payload = {"t_name": t_name, "iat": now, "exp": now + TOKEN_TTL_SECONDS}
     payload_b = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
     payload_s = _b64url_encode(payload_b)
 
-    sig = hmac.new(SECRET.encode("utf-8"), payload_s.encode("utf-8"), hashlib.sha256).digest()
-    sig_s = _b64url_encode(sig)
+    sig_s = _sign(payload_s)
     return f"{payload_s}.{sig_s}"
 
 def verify_token(token: str) -> Dict[str, Any]:
+    now = int(time.time())
+    hit = _verified.get(token)
+    if hit is not None:
+        payload, exp = hit
+        if exp < now:
+            del _verified[token]
+            raise SystemError(401, "Token expired")
+        _verified.move_to_end(token)
+        return payload
+
+    payload = _verify_uncached(token, now)
+    _verified[token] = (payload, int(payload.get("exp", 0)))
+    if len(_verified) > TOKEN_CACHE_SIZE:
+        _verified.popitem(last=False)
+    return payload
+
+def _verify_uncached(token: str, now: int) -> Dict[str, Any]:
     try:
         payload_s, sig_s = token.split(".", 1)
     except ValueError:
         raise SystemError(401, "Invalid token")
 
-    expected_sig = hmac.new(SECRET.encode("utf-8"), payload_s.encode("utf-8"), hashlib.sha256).digest()
-    if not hmac.compare_digest(_b64url_encode(expected_sig), sig_s):
+    if not hmac.compare_digest(_sign(payload_s), sig_s):
         raise SystemError(401, "Invalid token signature")
 
     payload = json.loads(_b64url_decode(payload_s).decode("utf-8"))
-    now = int(time.time())
     if int(payload.get("exp", 0)) < now:
         raise SystemError(401, "Token expired")
 
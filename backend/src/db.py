@@ -1,18 +1,106 @@
 # src/db.py
-import os
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
+from pydantic_settings import BaseSettings
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    "postgresql+asyncpg://postgres:postgres@db:5432/postgres",  # חשוב: db ולא localhost
-)
+from src.services.metrics import instrument_engine, record_phase
 
-engine = create_async_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-)
+
+class DbSettings(BaseSettings):
+    # every field is read from the env var of the same name (case-insensitive), e.g. DB_POOL_SIZE=20
+    database_url: str = "postgresql+asyncpg://postgres:postgres@db:5432/postgres"  # חשוב: db ולא localhost
+    database_read_url: Optional[str] = None   # read replica for get_read_db, defaults to database_url
+
+    # per worker process: the DB sees (pool_size + max_overflow) x WEB_CONCURRENCY connections at most
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30            # seconds to wait for a free connection before failing
+    db_pool_recycle: int = 1800            # seconds before a connection is replaced
+    # pre-ping (a round trip per checkout) replaces a dead connection before a request gets it.
+    # With it off, the request that hits a dropped connection fails; SQLAlchemy then invalidates
+    # the pool on its own, so later checkouts reconnect
+    db_pool_pre_ping: bool = True
+
+    db_statement_cache_size: int = 100     # asyncpg prepared statements per connection (0 behind pgbouncer)
+    db_command_timeout: Optional[float] = None
+
+
+settings = DbSettings()
+DATABASE_URL = settings.database_url
+
+
+class _PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.disconnects = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+pool_stats = _PoolStats()
+
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    """ queue pool that records how long each checkout waited for a connection """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            pool_stats.record_wait(waited)
+            record_phase("pool_wait", waited)
+
+
+def _make_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=_TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            "statement_cache_size": settings.db_statement_cache_size,
+            "command_timeout": settings.db_command_timeout,
+        },
+    )
+
+engine = _make_engine(DATABASE_URL)
+read_engine = _make_engine(settings.database_read_url) if settings.database_read_url else engine
+
+def _on_db_error(context) -> None:
+    # counts only; invalidating the pool on a disconnect is SQLAlchemy's default
+    if context.is_disconnect:
+        pool_stats.disconnects += 1
+
+for _engine in {engine, read_engine}:
+    event.listen(_engine.sync_engine, "handle_error", _on_db_error)
+    instrument_engine(_engine)
+
+def get_pool_stats() -> Dict[str, Any]:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": settings.db_max_overflow,
+        "checkouts": pool_stats.checkouts,
+        "wait_avg_ms": round(pool_stats.wait_total / pool_stats.checkouts * 1000, 3) if pool_stats.checkouts else 0.0,
+        "wait_max_ms": round(pool_stats.wait_max * 1000, 3),
+        "disconnects": pool_stats.disconnects,
+        "pre_ping": settings.db_pool_pre_ping,
+        "read_replica": read_engine is not engine,
+    }
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -25,3 +113,10 @@ Base = declarative_base()
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db() -> AsyncGenerator[AsyncConnection, None]:
+    """ Core connection in a READ ONLY transaction (BEGIN READ ONLY, no extra round trip).
+    For GET routes: plain rows, no identity map / unit of work. Never commit through it. """
+    async with read_engine.connect() as conn:
+        conn = await conn.execution_options(postgresql_readonly=True)
+        yield conn
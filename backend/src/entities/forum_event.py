@@ -2,8 +2,8 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
-from pydantic import BaseModel
-from sqlalchemy import DateTime, ForeignKey, Integer, String 
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String 
 from sqlalchemy.orm import Mapped, relationship, mapped_column  # mapped_column newer,better than Column (defines python type, defines DB column)
 
 from src.entities.base import Base
@@ -12,6 +12,9 @@ if TYPE_CHECKING:
 
 class ForumEvent(Base):
     __tablename__ = "forum_events"
+    __table_args__ = (
+        Index("ix_forum_events_date_time", "date_time"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     date_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -23,8 +26,9 @@ class ForumEvent(Base):
 
 
 class ForumEventResult(BaseModel):
-    def __init__(self, fe: ForumEvent):
-        self.id = fe.id
-        self.name = fe.name
-        self.date_time = fe.date_time
-        self.team_name = fe.team_name
+    id: int
+    name: str
+    date_time: datetime
+    team_name: str
+
+    model_config = ConfigDict(from_attributes=True)
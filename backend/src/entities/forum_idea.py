@@ -1,8 +1,8 @@
 
 from __future__ import annotations
-from pydantic import BaseModel
-from pydantic import BaseModel
-from sqlalchemy import ForeignKey, Integer, Text
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import ForeignKey, Index, Integer, Text, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from typing import TYPE_CHECKING
 from sqlalchemy.orm import Mapped, relationship, mapped_column  # mapped_column newer,better than Column (defines python type, defines DB column)
 
@@ -14,6 +14,9 @@ if TYPE_CHECKING:
 
 class ForumIdea(Base):
     __tablename__ = "forum_ideas"
+    __table_args__ = (
+        Index("ix_forum_ideas_team_name_id", "team_name", "id"),  # teamForumIdeas: WHERE team_name ORDER BY id DESC
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     idea: Mapped[str] = mapped_column(Text, nullable=False)
@@ -25,9 +28,14 @@ class ForumIdea(Base):
     team: Mapped["Team"] = relationship(back_populates="forum_ideas")
 
 
+# generated + GIN indexed by migration 7, unmapped like MESSAGE_SEARCH
+FORUM_IDEA_SEARCH = literal_column("forum_ideas.search", TSVECTOR)
+
+
 class ForumIdeaResult(BaseModel):
-    def __init__(self, fi: ForumIdea):
-        self.id = fi.id
-        self.idea = fi.idea
-        self.user_t_name = fi.user_t_name
-        self.team_name = fi.team_name
+    id: int
+    idea: str
+    user_t_name: str
+    team_name: str
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,8 +1,10 @@
 
 from __future__ import annotations
 from datetime import datetime
-from typing import TYPE_CHECKING
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text 
+from typing import TYPE_CHECKING, List, Optional
+from pydantic import BaseModel
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, relationship, mapped_column  # mapped_column newer,better than Column (defines python type, defines DB column)
 
 from src.entities.base import Base
@@ -11,6 +13,9 @@ if TYPE_CHECKING:
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_date_time_id", "date_time", "id"),  # feed: ORDER BY date_time DESC, id DESC + keyset on both
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -19,4 +24,23 @@ class Message(Base):
     user_t_name: Mapped[str] = mapped_column(ForeignKey("users.t_name", ondelete="CASCADE"), nullable=False)
     date_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
-    user: Mapped["User"] = relationship(back_populates="messages")
\ No newline at end of file
+    user: Mapped["User"] = relationship(back_populates="messages")
+
+
+# Full-text search vector over title (weight A) and message (B): a generated column with a GIN
+# index, both created by migration 7 (src/migrations.py). Not mapped on purpose, so generic
+# lists and plain column selects never carry it; search queries reference it through this.
+MESSAGE_SEARCH = literal_column("messages.search", TSVECTOR)
+
+
+class MessageFeedItem(BaseModel):
+    id: int
+    title: str
+    message: str
+    user_t_name: str
+    author_name: str
+    date_time: datetime
+
+class MessageFeedPage(BaseModel):
+    items: List[MessageFeedItem]    # newest first
+    next_before: Optional[str]      # pass as ?before= for the next (older) page, null on the last page
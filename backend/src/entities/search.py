@@ -0,0 +1,22 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+SearchKind = Literal["messages", "forum_ideas"]
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: int
+    rank: float
+    title: Optional[str]            # messages only
+    snippet: str                    # matched words wrapped in HIGHLIGHT_START / HIGHLIGHT_STOP
+    user_t_name: str
+    date_time: Optional[datetime]   # messages only
+    team_name: Optional[str]        # forum ideas only
+
+class SearchPage(BaseModel):
+    query: str
+    items: List[SearchHit]          # best match first
+    next_offset: Optional[int]      # pass as ?offset= for the next page, null on the last page
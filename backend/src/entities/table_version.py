@@ -0,0 +1,13 @@
+from __future__ import annotations
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.entities.base import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # bumped by the table_versions_bump trigger on every INSERT/UPDATE/DELETE statement (see migrations.py)
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
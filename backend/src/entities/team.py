@@ -1,10 +1,16 @@
 
 from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
+from pydantic import BaseModel
 from sqlalchemy import Integer, String, Text 
 from sqlalchemy.orm import Mapped, relationship, mapped_column  # mapped_column newer,better than Column (defines python type, defines DB column)
 
 from src.entities.base import Base
+from src.entities.forum_event import ForumEventResult
+from src.entities.forum_idea import ForumIdeaResult
+from src.entities.forum_settings import ForumScheduleResult
+from src.entities.team_link import TeamLinkResult
+from src.entities.user import TeamMemberResult
 if TYPE_CHECKING:
     from src.entities.user import User
     from src.entities.team_link import TeamLink
@@ -24,3 +30,14 @@ class Team(Base):
     forum_ideas: Mapped[List["ForumIdea"]] = relationship(back_populates="team")
     forum_events: Mapped[List["ForumEvent"]] = relationship(back_populates="team")
 
+
+class TeamDashboardResult(BaseModel):
+    name: str
+    description: Optional[str]
+    order: int
+
+    links: List[TeamLinkResult]
+    forum_ideas: List[ForumIdeaResult]          # newest first
+    members: List[TeamMemberResult]
+    forum_events: List[ForumEventResult]        # upcoming, soonest first
+    forum_slots: List[ForumScheduleResult]      # this team's upcoming slots in the forum schedule
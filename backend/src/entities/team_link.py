@@ -2,7 +2,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import ForeignKey, Integer, String 
+from sqlalchemy import ForeignKey, Index, Integer, String 
 from sqlalchemy.orm import Mapped, relationship, mapped_column  # mapped_column newer,better than Column (defines python type, defines DB column)
 
 from src.entities.base import Base
@@ -12,6 +12,9 @@ if TYPE_CHECKING:
 
 class TeamLink(Base):
     __tablename__ = "team_links"
+    __table_args__ = (
+        Index("ix_team_links_team_name", "team_name"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     link: Mapped[str] = mapped_column(String(500), nullable=False)
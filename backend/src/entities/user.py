@@ -2,7 +2,8 @@
 from __future__ import annotations
 from datetime import date
 from typing import TYPE_CHECKING, List, Optional
-from sqlalchemy import Date, ForeignKey, String
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, cast, extract, literal_column
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from src.entities.base import Base
@@ -17,6 +18,9 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_release_date", "release_date"),  # upcoming releases: a plain date range
+    )
 
     t_name: Mapped[str] = mapped_column(String(20), primary_key=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -38,3 +42,30 @@ class User(Base):
     messages: Mapped[List["Message"]] = relationship(back_populates="user")
     user_updates: Mapped[List["UserUpdate"]] = relationship(back_populates="user")
     forum_ideas: Mapped[List["ForumIdea"]] = relationship(back_populates="user")
+
+
+# Birthday as month * 100 + day (March 7 -> 307): sorts like the calendar and ignores the year,
+# so "the next N days" is one or two ranges on this index (two when the window wraps past Dec 31).
+# The 100 is inlined, not a bind parameter, so the queries' expression matches the index's.
+BIRTHDAY_MMDD = cast(extract("month", User.birthday) * literal_column("100") + extract("day", User.birthday), Integer)
+User.__table__.append_constraint(Index("ix_users_birthday_mmdd", BIRTHDAY_MMDD))   # a cast, so Index can't find the table itself
+
+
+class TeamMemberResult(BaseModel):
+    t_name: str
+    name: str
+    release_date: Optional[date] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UpcomingDateResult(BaseModel):
+    t_name: str
+    name: str
+    team_name: Optional[str] = None
+    date: date          # the next occurrence for birthdays, the release date itself for releases
+    days_until: int
+
+class UpcomingDatesResult(BaseModel):
+    birthdays: List[UpcomingDateResult]   # soonest first
+    releases: List[UpcomingDateResult]
+    truncated: bool = False               # either list was cut at UPCOMING_MAX_ROWS
@@ -2,7 +2,8 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
-from sqlalchemy import DateTime, ForeignKey, Integer, String 
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, relationship, mapped_column  # mapped_column newer,better than Column (defines python type, defines DB column)
 
 from src.entities.base import Base
@@ -12,6 +13,9 @@ if TYPE_CHECKING:
 
 class UserUpdate(Base):
     __tablename__ = "user_updates"
+    __table_args__ = (
+        Index("ix_user_updates_start_end", "start_date_time", "end_date_time"),  # time-window lookups
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_t_name: Mapped[str] = mapped_column(ForeignKey("users.t_name", ondelete="CASCADE"), nullable=False)
@@ -21,3 +25,23 @@ class UserUpdate(Base):
     end_date_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     user: Mapped["User"] = relationship(back_populates="user_updates")
+
+
+# [start, end) as a tstzrange with a GiST index, so "overlaps this window" is one index probe
+# instead of two range scans. least/greatest: a row entered with start > end must not break inserts.
+# Queries have to use this exact expression for the planner to match the index.
+USER_UPDATE_PERIOD = func.tstzrange(
+    func.least(UserUpdate.start_date_time, UserUpdate.end_date_time),
+    func.greatest(UserUpdate.start_date_time, UserUpdate.end_date_time),
+)
+Index("ix_user_updates_period", USER_UPDATE_PERIOD, postgresql_using="gist")
+
+
+class UserUpdateResult(BaseModel):
+    id: int
+    user_t_name: str
+    update: str
+    start_date_time: datetime
+    end_date_time: datetime
+
+    model_config = ConfigDict(from_attributes=True)
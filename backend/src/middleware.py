@@ -0,0 +1,202 @@
+# src/middleware.py
+# Pure ASGI middlewares (no BaseHTTPMiddleware: no extra task or body copy per request).
+# The cache and compression layers only touch single-body responses; streaming responses (NDJSON, SSE) pass through as is.
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services import metrics
+from src.services.http_cache import etag_matches, strong_etag
+
+try:
+    import brotli
+except ImportError:  # declared in pyproject.toml; without it only gzip is offered
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+_COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+
+
+class HttpCacheMiddleware:
+    """ GET/HEAD 200s: Cache-Control by path prefix, strong ETag from the body (unless the route
+    set one), and 304 Not Modified when If-None-Match matches. """
+
+    def __init__(self, app: ASGIApp, policies: Optional[Dict[str, str]] = None, default_policy: str = "private, no-cache"):
+        self.app = app
+        # longest prefix wins
+        self.policies = sorted((policies or {}).items(), key=lambda kv: len(kv[0]), reverse=True)
+        self.default_policy = default_policy
+
+    def _policy_for(self, path: str) -> str:
+        for prefix, policy in self.policies:
+            if path.startswith(prefix):
+                return policy
+        return self.default_policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._policy_for(scope["path"])
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def _send(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            if start["status"] != 200 or message.get("more_body"):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = policy
+            if "no-store" not in headers["cache-control"]:
+                etag = headers.get("etag") or strong_etag(message.get("body", b""))
+                headers["ETag"] = etag
+                if etag_matches(if_none_match, etag):
+                    kept = [(k, v) for k, v in start["headers"] if k not in (b"content-length", b"content-type")]
+                    await send({"type": "http.response.start", "status": 304, "headers": kept})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+
+def _accepted(accept_encoding: str) -> List[str]:
+    out = []
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        out.append(name.strip().lower())
+    return out
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)   # fast setting, still smaller than gzip -6 on JSON
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressionMiddleware:
+    """ br/gzip for single-body responses of at least minimum_size bytes with a text-like content type """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def _send(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            compressible = headers.get("content-type", "").startswith(_COMPRESSIBLE)
+            if message.get("more_body") or not compressible or "content-encoding" in headers or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = _compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag   # different bytes than the identity representation
+            await send(start)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, _send)
+
+
+def _route_template(scope: Scope) -> str:
+    """ "/api/users/t_bob" -> "/api/users/{t_name}", so the metric labels stay bounded """
+    template = getattr(scope.get("route"), "path_format", None)   # the router sets scope["route"] on a match
+    if template is None:
+        return "unmatched"
+    # an included router's routes are relative to its prefix ("/api"); no route here uses {x:path},
+    # so the prefix is whatever the template's segments don't cover
+    prefix = "/".join(scope["path"].split("/")[:-template.count("/")])
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """ latency / status / SQL statements per route, a Server-Timing header, and the sampled profiler """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not metrics.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = metrics.begin_request()
+        profiler = metrics.start_profile()
+        start = time.perf_counter()
+        status = 500
+
+        async def _send(message: Message) -> None:
+            nonlocal status, profiler
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                app_ms = (time.perf_counter() - start) * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", f'app;dur={app_ms:.1f}, db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+            elif profiler is not None:   # stop at the first body chunk: a stream could run for hours
+                metrics.finish_profile(profiler, scope["method"], scope["path"], time.perf_counter() - start)
+                profiler = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            if profiler is not None:
+                metrics.finish_profile(profiler, scope["method"], scope["path"], time.perf_counter() - start)
+            metrics.end_request(stats, token, scope["method"], _route_template(scope), status, time.perf_counter() - start)
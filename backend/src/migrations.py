@@ -0,0 +1,171 @@
+# src/migrations.py
+# Versioned schema changes for databases that already exist.
+# Base.metadata.create_all only creates missing tables, so anything added to an existing
+# table (columns, indexes) must also be listed here. Statements are idempotent so a fresh
+# database, where create_all already built everything, just records the versions.
+#
+#   python -m src.migrations            apply pending migrations
+#   python -m src.migrations --status   list applied / pending versions
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+MIGRATIONS_LOCK_KEY = 7_310_001  # pg advisory lock: one runner at a time across workers
+
+VERSIONED_TABLES = [
+    "users", "roles", "user_roles", "teams", "team_links", "messages", "user_updates",
+    "forum_ideas", "forum_events", "forum_settings", "cleaning_duties",
+]
+STREAMED_TABLES = ["messages", "user_updates"]   # rows pushed to GET /api/stream (src/services/events.py)
+
+def _tsvector(column: str, weight: str) -> str:
+    return (f"setweight(to_tsvector('english', {column}), '{weight}') || "
+            f"setweight(to_tsvector('simple', {column}), '{weight}')")
+
+# (version, name, statements) - append only, never edit an applied version
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "indexes on hot filter columns", [
+        "CREATE INDEX IF NOT EXISTS ix_forum_ideas_team_name_id ON forum_ideas (team_name, id)",
+        "CREATE INDEX IF NOT EXISTS ix_team_links_team_name ON team_links (team_name)",
+        "CREATE INDEX IF NOT EXISTS ix_forum_events_date_time ON forum_events (date_time)",
+        "CREATE INDEX IF NOT EXISTS ix_messages_date_time ON messages (date_time)",
+        "CREATE INDEX IF NOT EXISTS ix_user_updates_start_end ON user_updates (start_date_time, end_date_time)",
+    ]),
+    (2, "per-table change versions", [
+        "CREATE TABLE IF NOT EXISTS table_versions (table_name VARCHAR(64) PRIMARY KEY, version BIGINT NOT NULL DEFAULT 0)",
+        """CREATE OR REPLACE FUNCTION table_versions_bump() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+        *[
+            f"CREATE OR REPLACE TRIGGER {t}_version AFTER INSERT OR UPDATE OR DELETE ON {t} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION table_versions_bump()"
+            for t in VERSIONED_TABLES
+        ],
+    ]),
+    (3, "change notifications for the live stream", [
+        # NOTIFY is delivered on commit only, so listeners never see rolled back rows
+        """CREATE OR REPLACE FUNCTION portal_notify_change() RETURNS trigger AS $$
+        DECLARE
+            r JSONB;
+            payload TEXT;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN r := to_jsonb(OLD); ELSE r := to_jsonb(NEW); END IF;
+            payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', r)::text;
+            IF octet_length(payload) > 7900 THEN   -- NOTIFY payloads are capped at 8000 bytes
+                payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', jsonb_build_object('id', r->'id'), 'truncated', true)::text;
+            END IF;
+            PERFORM pg_notify('portal_changes', payload);
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+        *[
+            f"CREATE OR REPLACE TRIGGER {t}_notify AFTER INSERT OR UPDATE OR DELETE ON {t} "
+            f"FOR EACH ROW EXECUTE FUNCTION portal_notify_change()"
+            for t in STREAMED_TABLES
+        ],
+    ]),
+    (5, "interval index on user update periods", [
+        "CREATE INDEX IF NOT EXISTS ix_user_updates_period ON user_updates USING gist "
+        "(tstzrange(least(start_date_time, end_date_time), greatest(start_date_time, end_date_time)))",
+    ]),
+    (6, "message feed keyset index", [
+        "CREATE INDEX IF NOT EXISTS ix_messages_date_time_id ON messages (date_time, id)",
+        "DROP INDEX IF EXISTS ix_messages_date_time",   # a prefix of the new one
+    ]),
+    (7, "full-text search columns", [
+        # every text is indexed twice: 'english' stems English words (and drops its stop words),
+        # 'simple' keeps each word as written - Postgres ships no Hebrew dictionary, so that is
+        # what Hebrew text matches against. Adding a STORED column rewrites the table once.
+        f"ALTER TABLE messages ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS ("
+        f"{_tsvector('title', 'A')} || {_tsvector('message', 'B')}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_messages_search ON messages USING gin (search)",
+        f"ALTER TABLE forum_ideas ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS ({_tsvector('idea', 'A')}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_forum_ideas_search ON forum_ideas USING gin (search)",
+        # same function as in 3, minus the search column: no point streaming a tsvector to browsers
+        """CREATE OR REPLACE FUNCTION portal_notify_change() RETURNS trigger AS $$
+        DECLARE
+            r JSONB;
+            payload TEXT;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN r := to_jsonb(OLD) - 'search'; ELSE r := to_jsonb(NEW) - 'search'; END IF;
+            payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', r)::text;
+            IF octet_length(payload) > 7900 THEN   -- NOTIFY payloads are capped at 8000 bytes
+                payload := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', jsonb_build_object('id', r->'id'), 'truncated', true)::text;
+            END IF;
+            PERFORM pg_notify('portal_changes', payload);
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+    ]),
+    (8, "upcoming birthdays and releases", [
+        # must stay the exact expression of BIRTHDAY_MMDD (src/entities/user.py)
+        "CREATE INDEX IF NOT EXISTS ix_users_birthday_mmdd ON users "
+        "(CAST(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday) AS INTEGER))",
+        "CREATE INDEX IF NOT EXISTS ix_users_release_date ON users (release_date)",
+    ]),
+    (9, "drop the unused shared counters", [
+        # version 4 created shared_counters for a rate limiter that was never kept; it is gone from
+        # this list, and databases that applied it lose the table here
+        "DROP TABLE IF EXISTS shared_counters",
+    ]),
+]
+
+
+async def _ensure_table(conn: AsyncConnection) -> None:
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name VARCHAR(200) NOT NULL,"
+        " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+
+async def applied_versions(conn: AsyncConnection) -> List[int]:
+    await _ensure_table(conn)
+    return list((await conn.scalars(text("SELECT version FROM schema_migrations ORDER BY version"))).all())
+
+async def run_migrations(engine: AsyncEngine) -> List[int]:
+    """ applies pending migrations in one transaction, returns the versions applied """
+    done = []
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+        applied = set(await applied_versions(conn))
+        for version, name, statements in MIGRATIONS:
+            if version in applied:
+                continue
+            for sql in statements:
+                await conn.execute(text(sql))
+            await conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": version, "name": name},
+            )
+            done.append(version)
+    return done
+
+
+async def _main(status: bool) -> None:
+    from src.app import engine   # importing the app registers every entity on Base.metadata
+    from src.entities.base import Base
+
+    if status:
+        async with engine.begin() as conn:
+            applied = set(await applied_versions(conn))
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:>4}  {'applied' if version in applied else 'pending'}  {name}")
+    else:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        applied = await run_migrations(engine)
+        print(f"applied {applied}" if applied else "schema is up to date")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations")
+    parser.add_argument("--status", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(_main(args.status))
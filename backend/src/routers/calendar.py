@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Dict
+from urllib.parse import urlencode
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.deps import get_current_identity, is_admin
+from src.db import get_db
+from src.entities.system_error import SystemError
+from src.services.calendar import check_feed_token, feed_scope, feed_token, get_calendar
+from src.services.http_cache import etag_matches
+
+calendar_router = APIRouter(tags=["calendar"])
+
+
+@calendar_router.get("/calendar.ics", response_class=Response)
+async def calendar_feed(
+    request: Request,
+    token: str | None = Query(None, description="from GET /api/calendar/link"),
+    team: str | None = Query(None, description="only this team's forums, duties and birthdays"),
+    user: str | None = Query(None, description="t_name: their team's forums, their cleaning duties and birthday"),
+    db: AsyncSession = Depends(get_db),
+):
+    """ iCalendar feed to subscribe to from a calendar app """
+    if team and user:
+        raise SystemError(400, "Pass either team or user, not both")
+    check_feed_token(feed_scope(team, user), token)
+    body, etag = await get_calendar(db, team=team, user=user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/calendar; charset=utf-8", headers=headers)
+
+@calendar_router.get("/calendar/link", response_model=Dict[str, str])
+async def calendar_link(
+    team: str | None = Query(None, description="admins only; without team or all: the caller's own feed"),
+    all: bool = Query(False, description="admins only: everyone's feed"),
+    identity=Depends(get_current_identity),
+):
+    """ {"url": ...} of a calendar feed, with its token: subscribe to it, don't share it """
+    if team or all:
+        if not is_admin(identity):
+            raise SystemError(403, f"Forbidden, You are not an admin")
+        params = {"team": team} if team else {}
+    else:
+        params = {"user": identity["t_name"]}
+    params["token"] = feed_token(feed_scope(params.get("team"), params.get("user")))
+    return {"url": f"/api/calendar.ics?{urlencode(params)}"}
@@ -3,13 +3,13 @@ from __future__ import annotations
 from datetime import date
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.auth.deps import require_admin
-from src.db import get_db
+from src.db import get_db, get_read_db
 
 from src.entities.cleaning_duties import CleaningDuty
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class CleaningDutyCreate(BaseModel):
     name1: str
@@ -27,13 +27,17 @@ cleaning_duties_router = APIRouter(prefix="/cleaning_duties", tags=["cleaning_du
 
 
 @cleaning_duties_router.get("")
-async def list_cleaning_duties(db: AsyncSession = Depends(get_db)):
-    return await list_all(db, CleaningDuty)
+async def list_cleaning_duties(page: ListParams = Depends(), db: AsyncConnection = Depends(get_read_db)):
+    return await list_all(db, CleaningDuty, page)
 
 @cleaning_duties_router.post("")
 async def create_cleaning_duty(payload: CleaningDutyCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, CleaningDuty, payload)
 
+@cleaning_duties_router.post("/bulk")
+async def bulk_cleaning_duties(payload: BulkPayload[CleaningDutyCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, CleaningDuty, payload, CleaningDutyUpdate)
+
 @cleaning_duties_router.patch("/{id}")
 async def update_cleaning_duty(id: int, payload: CleaningDutyUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, CleaningDuty, id, payload)
@@ -5,15 +5,14 @@ from typing import List
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.auth.deps import require_admin
 from src.entities.forum_event import ForumEvent, ForumEventResult
-from src.db import get_db
+from src.db import get_db, get_read_db
 
-from src.services.unique_actions import (get_future_forum_events)
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.unique_actions import get_future_forum_events
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class ForumEventCreate(BaseModel):
     date_time: datetime
@@ -29,17 +28,21 @@ forum_events_router = APIRouter(prefix="/forum_events", tags=["forum"])
 
 
 @forum_events_router.get("")
-async def list_forum_events(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, ForumEvent)
+async def list_forum_events(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, ForumEvent, page)
 
 @forum_events_router.get("/futureForumEvents", response_model=List[ForumEventResult])
-async def future_forum_events(db: Session = Depends(get_db)):
+async def future_forum_events(db: AsyncConnection = Depends(get_read_db)):
     return await get_future_forum_events(db)
 
 @forum_events_router.post("")
 async def create_forum_event(payload: ForumEventCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, ForumEvent, payload)
 
+@forum_events_router.post("/bulk")
+async def bulk_forum_events(payload: BulkPayload[ForumEventCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, ForumEvent, payload, ForumEventUpdate)
+
 @forum_events_router.patch("/{id}")
 async def update_forum_event(id: int, payload: ForumEventUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, ForumEvent, id, payload)
@@ -4,15 +4,14 @@ from typing import List
 
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.auth.deps import require_admin
 from src.entities.forum_idea import ForumIdea, ForumIdeaResult
-from src.db import get_db
+from src.db import get_db, get_read_db
 
 from src.services.unique_actions import (get_team_forum_ideas)
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class ForumIdeaCreate(BaseModel):
     idea: str
@@ -29,17 +28,21 @@ forum_ideas_router = APIRouter(prefix="/forum_ideas", tags=["forum"])
 
 
 @forum_ideas_router.get("")
-async def list_forum_ideas(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, ForumIdea)
+async def list_forum_ideas(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, ForumIdea, page)
 
 @forum_ideas_router.get("/teamForumIdeas/{team_name}", response_model=List[ForumIdeaResult])
-async def team_forum_ideas(team_name: str, db: Session = Depends(get_db)):
+async def team_forum_ideas(team_name: str, db: AsyncConnection = Depends(get_read_db)):
     return await get_team_forum_ideas(db, team_name)
 
 @forum_ideas_router.post("")
 async def create_forum_idea(payload: ForumIdeaCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, ForumIdea, payload)
 
+@forum_ideas_router.post("/bulk")
+async def bulk_forum_ideas(payload: BulkPayload[ForumIdeaCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, ForumIdea, payload, ForumIdeaUpdate)
+
 @forum_ideas_router.patch("/{id}")
 async def update_forum_idea(id: int, payload: ForumIdeaUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, ForumIdea, id, payload)
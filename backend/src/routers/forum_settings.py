@@ -4,7 +4,7 @@ from typing import List
 from datetime import datetime
 
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,8 +12,9 @@ from src.auth.deps import require_admin
 from src.entities.forum_settings import ForumSettings, ForumScheduleResult
 from src.db import get_db
 
-from src.services.unique_actions import (get_future_forum_schedule)
-from src.services.common_actions import (list_all, update_one)
+from src.services.unique_actions import (LOCAL_TZ, get_future_forum_schedule, get_cached_forum_schedule, schedule_etag)
+from src.services.http_cache import etag_matches
+from src.services.common_actions import (ListParams, list_all, update_one)
 
 class ForumSettingsUpdate(BaseModel):
     first_forum_datetime: datetime | None = None
@@ -23,12 +24,32 @@ forum_settings_router = APIRouter(prefix="/forum_settings", tags=["forum"])
 
 
 @forum_settings_router.get("/futureForumSchedule", response_model=List[ForumScheduleResult])
-async def future_forum_schedule(db: Session = Depends(get_db)):
-    return await get_future_forum_schedule(db, 54)
+async def future_forum_schedule(
+    request: Request,
+    response: Response,
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+    limit: int = Query(54, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    if from_ is None and to is None:
+        schedule, etag = await get_cached_forum_schedule(db, limit)
+    else:
+        # naive datetimes are portal-local time
+        start = from_.replace(tzinfo=from_.tzinfo or LOCAL_TZ) if from_ else None
+        end = to.replace(tzinfo=to.tzinfo or LOCAL_TZ) if to else None
+        schedule = await get_future_forum_schedule(db, limit, start, end)
+        etag = schedule_etag(schedule)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}   # no-cache = always revalidate, so polls become 304s
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return schedule
 
 @forum_settings_router.get("")
-async def get_forum_settings(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, ForumSettings)
+async def get_forum_settings(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, ForumSettings, page)
 
 @forum_settings_router.patch("/{id}")
 async def update_forum_settings(id: int, payload: ForumSettingsUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
@@ -12,6 +12,12 @@ from src.routers.forum_idea import forum_ideas_router
 from src.routers.forum_event import forum_events_router
 from src.routers.forum_settings import forum_settings_router
 from src.routers.cleaning_duties import cleaning_duties_router
+from src.routers.system import system_router
+from src.routers.versions import versions_router
+from src.routers.stream import stream_router
+from src.routers.metrics import metrics_router
+from src.routers.search import search_router
+from src.routers.calendar import calendar_router
 
 main_router = APIRouter(prefix="/api")
 
@@ -27,3 +33,25 @@ main_router.include_router(user_roles_router)
 main_router.include_router(teams_router)
 main_router.include_router(team_links_router)
 main_router.include_router(auth_router)
+main_router.include_router(system_router)
+main_router.include_router(versions_router)
+main_router.include_router(stream_router)
+main_router.include_router(metrics_router)
+main_router.include_router(search_router)
+main_router.include_router(calendar_router)
+
+# Cache-Control for GET responses, by path prefix (longest wins, see HttpCacheMiddleware).
+# Anything not listed gets "private, no-cache": browsers keep a copy but revalidate it
+# with If-None-Match every time, which costs a 304 instead of a full body.
+cache_policies = {
+    "/api/auth": "no-store",
+    "/api/system": "no-store",
+    "/api/metrics": "no-store",
+    "/api/stream/ticket": "no-store",
+    "/api/forum_settings/futureForumSchedule": "public, no-cache",
+    "/api/forum_events/futureForumEvents": "public, no-cache",
+    "/api/cleaning_duties": "public, no-cache",
+    "/api/versions": "public, no-cache",
+    "/api/user_updates/active": "private, no-cache",   # admin-only, like the user_updates list
+    "/api/users/upcoming": "private, no-cache",
+}
@@ -2,15 +2,16 @@
 from __future__ import annotations
 
 from datetime import datetime
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.auth.deps import require_admin
-from src.db import get_db
+from src.db import get_db, get_read_db
 
-from src.entities.message import Message
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.entities.message import Message, MessageFeedPage
+from src.services.unique_actions import get_message_feed
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class MessageCreate(BaseModel):
     title: str
@@ -28,13 +29,25 @@ messages_router = APIRouter(prefix="/messages", tags=["messages"])
 
 
 @messages_router.get("")
-async def list_messages(db: AsyncSession = Depends(get_db)):
-    return await list_all(db, Message)
+async def list_messages(page: ListParams = Depends(), db: AsyncConnection = Depends(get_read_db)):
+    return await list_all(db, Message, page)
+
+@messages_router.get("/feed", response_model=MessageFeedPage)
+async def message_feed(
+    limit: int = Query(50, ge=1, le=500),
+    before: str | None = Query(None, description="next_before of the previous page"),
+    db: AsyncConnection = Depends(get_read_db),
+):
+    return await get_message_feed(db, limit, before)
 
 @messages_router.post("")
 async def create_message(payload: MessageCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, Message, payload)
 
+@messages_router.post("/bulk")
+async def bulk_messages(payload: BulkPayload[MessageCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, Message, payload, MessageUpdate)
+
 @messages_router.patch("/{id}")
 async def update_message(id: int, payload: MessageUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, Message, id, payload)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hmac
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.auth.deps import is_admin, security
+from src.auth.hashing import hash_pool_stats
+from src.auth.token import verify_token
+from src.db import get_pool_stats
+from src.entities.system_error import SystemError
+from src.services.events import hub
+from src.services.metrics import METRICS_TOKEN, render
+
+metrics_router = APIRouter(prefix="/metrics", tags=["system"])
+
+
+@metrics_router.get("", response_class=PlainTextResponse)
+async def prometheus_metrics(creds: HTTPAuthorizationCredentials | None = Depends(security)):
+    """ Prometheus text format, for admins and for scrapers sending "Authorization: Bearer $METRICS_TOKEN" """
+    if not creds or not creds.credentials:
+        raise SystemError(401, "Unauthorized")
+    scraper = bool(METRICS_TOKEN) and hmac.compare_digest(creds.credentials.encode("utf-8"), METRICS_TOKEN.encode("utf-8"))
+    if not scraper and not is_admin(verify_token(creds.credentials)):
+        raise SystemError(403, f"Forbidden, You are not an admin")
+
+    pool, hashing, stream = get_pool_stats(), hash_pool_stats(), hub.stats()
+    gauges = {
+        "portal_db_pool_checked_out": pool["checked_out"],
+        "portal_db_pool_overflow": pool["overflow"],
+        "portal_db_pool_wait_max_seconds": pool["wait_max_ms"] / 1000,
+        "portal_db_disconnects": pool["disconnects"],
+        "portal_hash_pool_in_flight": hashing["in_flight"],
+        "portal_hash_pool_queued": hashing["queued"],
+        "portal_hash_pool_rejected": hashing["rejected"],
+        "portal_stream_clients": stream["clients"],
+    }
+    return PlainTextResponse(render(gauges), media_type="text/plain; version=0.0.4")
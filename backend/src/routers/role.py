@@ -11,7 +11,7 @@ from src.db import get_db
 
 from src.entities.role import Role
 
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class RoleCreate(BaseModel):
     name: str
@@ -24,13 +24,17 @@ roles_router = APIRouter(prefix="/roles", tags=["roles"])
 
 
 @roles_router.get("")
-async def list_roles(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, Role)
+async def list_roles(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, Role, page)
 
 @roles_router.post("")
 async def create_role(payload: RoleCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, Role, payload)
 
+@roles_router.post("/bulk")
+async def bulk_roles(payload: BulkPayload[RoleCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, Role, payload, RoleUpdate)
+
 @roles_router.patch("/{name}")
 async def update_role(name: str, payload: RoleUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, Role, name, payload)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Literal
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.db import get_read_db
+from src.entities.search import SearchPage
+from src.entities.system_error import SystemError
+from src.services.http_cache import etag_matches
+from src.services.search import SEARCH_MAX_OFFSET, SEARCH_TABLES, search
+
+search_router = APIRouter(prefix="/search", tags=["search"])
+
+
+@search_router.get("", response_model=SearchPage)
+async def search_portal(
+    request: Request,
+    q: str = Query(..., max_length=200, description='words, "a phrase", or, -excluded (English and Hebrew)'),
+    kind: Literal["all", "messages", "forum_ideas"] = Query("all"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+    db: AsyncConnection = Depends(get_read_db),
+):
+    """ ranked matches with highlighted snippets, best first """
+    if not q.strip():
+        raise SystemError(400, "Empty search query")
+    body, etag = await search(db, q, SEARCH_TABLES if kind == "all" else (kind,), limit, offset)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
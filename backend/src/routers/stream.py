@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.auth.deps import get_current_identity, is_admin, security
+from src.auth.token import verify_token
+from src.entities.system_error import SystemError
+from src.migrations import STREAMED_TABLES
+from src.services.events import STREAM_MAX_CLIENTS, check_stream_ticket, hub, sse_stream, stream_ticket
+
+# tables whose REST lists are admin-only; everything else in STREAMED_TABLES is public
+ADMIN_STREAMED_TABLES = {"user_updates"}
+PUBLIC_STREAMED_TABLES = set(STREAMED_TABLES) - ADMIN_STREAMED_TABLES
+
+stream_router = APIRouter(prefix="/stream", tags=["stream"])
+
+
+@stream_router.get("")
+async def stream_changes(
+    tables: Optional[str] = Query(None, description="comma separated, e.g. messages,user_updates"),
+    ticket: Optional[str] = Query(None, description="from GET /api/stream/ticket: EventSource can't send a Bearer header"),
+    creds: HTTPAuthorizationCredentials | None = Depends(security),
+):
+    """ Server-sent events: one "change" event per committed row change {table, op, row}.
+    op RESYNC means events were dropped (slow client / listener reconnect) and "truncated" means only
+    the row id fit in the notification: reload in both cases.
+    Without an admin token or ticket only the public tables are streamed. """
+    if creds and creds.credentials:
+        admin = is_admin(verify_token(creds.credentials))
+    else:
+        admin = bool(ticket) and is_admin({"t_name": check_stream_ticket(ticket)})
+    allowed = set(STREAMED_TABLES) if admin else PUBLIC_STREAMED_TABLES
+
+    wanted = {t for t in tables.split(",") if t} if tables else set(allowed)
+    if not wanted <= set(STREAMED_TABLES):
+        raise SystemError(400, f"Streamable tables: {', '.join(STREAMED_TABLES)}")
+    if not wanted <= allowed:
+        raise SystemError(403, f"Forbidden, {', '.join(sorted(wanted - allowed))} need an admin token")
+    if len(hub.subscribers) >= STREAM_MAX_CLIENTS:
+        raise SystemError(503, "Too many live connections, try again later")
+
+    return StreamingResponse(
+        sse_stream(wanted),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},   # no proxy buffering
+    )
+
+@stream_router.get("/ticket", response_model=Dict[str, str])
+async def stream_ticket_for(identity=Depends(get_current_identity)):
+    """ {"ticket": ...} for ?ticket= on GET /api/stream; expires after STREAM_TICKET_TTL seconds """
+    return {"ticket": stream_ticket(identity["t_name"])}
@@ -0,0 +1,34 @@
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from src.auth.deps import require_admin
+from src.db import get_pool_stats
+from src.services.events import hub
+from src.services import metrics
+
+class ProfilerSettings(BaseModel):
+    rate: float = Field(ge=0, le=1)   # fraction of requests to profile, 0 = off
+
+system_router = APIRouter(prefix="/system", tags=["system"])
+
+
+@system_router.get("/pool")
+async def pool_stats(_=Depends(require_admin)):
+    return get_pool_stats()
+
+@system_router.get("/stream")
+async def stream_stats(_=Depends(require_admin)):
+    return hub.stats()
+
+@system_router.get("/profiles")
+async def recent_profiles(_=Depends(require_admin)):
+    """ newest first: cProfile output (cumulative time) of the last sampled requests """
+    return {"rate": metrics.profile_rate, "profiles": list(reversed(metrics.profiles))}
+
+@system_router.put("/profiler")
+async def set_profiler(payload: ProfilerSettings, _=Depends(require_admin)):
+    metrics.set_profile_rate(payload.rate)
+    return {"rate": metrics.profile_rate}
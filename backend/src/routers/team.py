@@ -2,14 +2,16 @@
 from __future__ import annotations
 
 from typing import Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.deps import require_admin
-from src.entities.team import Team
+from src.entities.team import Team, TeamDashboardResult
 
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
+from src.services.http_cache import etag_matches
+from src.services.unique_actions import get_team_dashboard
 
 from src.db import get_db
 
@@ -26,13 +28,27 @@ teams_router = APIRouter(prefix="/teams", tags=["teams"])
 
 
 @teams_router.get("")
-async def list_teams(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, Team)
+async def list_teams(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, Team, page)
+
+@teams_router.get("/{name}/dashboard", response_model=TeamDashboardResult)
+async def team_dashboard(name: str, request: Request, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    """ links, ideas, members, upcoming events and forum slots of one team.
+    Admin-only: links and members are; the public parts have their own public endpoints """
+    body, etag = await get_team_dashboard(db, name)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @teams_router.post("")
 async def create_team(payload: TeamCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, Team, payload)
 
+@teams_router.post("/bulk")
+async def bulk_teams(payload: BulkPayload[TeamCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, Team, payload, TeamUpdate)
+
 @teams_router.patch("/{name}")
 async def update_team(name: str, payload: TeamUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, Team, name, payload)
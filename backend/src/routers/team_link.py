@@ -3,15 +3,15 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.auth.deps import require_admin
 from src.entities.team_link import TeamLink
 
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 from src.services.unique_actions import get_teams_links
 
-from src.db import get_db
+from src.db import get_db, get_read_db
 
 class TeamLinkCreate(BaseModel):
     link: str
@@ -27,17 +27,21 @@ team_links_router = APIRouter(prefix="/team_links", tags=["team_links"])
 
 
 @team_links_router.get("")
-async def list_team_links(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, TeamLink)
+async def list_team_links(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, TeamLink, page)
 
 @team_links_router.get("/{team_name}")
-async def list_teams_link(team_name: str, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+async def list_teams_link(team_name: str, db: AsyncConnection = Depends(get_read_db), _=Depends(require_admin)):
     return await get_teams_links(db, team_name)
 
 @team_links_router.post("")
 async def create_team_link(payload: TeamLinkCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, TeamLink, payload)
 
+@team_links_router.post("/bulk")
+async def bulk_team_links(payload: BulkPayload[TeamLinkCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, TeamLink, payload, TeamLinkUpdate)
+
 @team_links_router.patch("/{id}")
 async def update_team_link(id: int, payload: TeamLinkUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, TeamLink, id, payload)
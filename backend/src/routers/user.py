@@ -1,20 +1,22 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy import select
 
 from src.auth.deps import require_admin
-from src.db import get_db
+from src.db import get_db, get_read_db
 
-from src.auth.auth import hash_password
-from src.entities.user import User
+from src.auth.hashing import hash_password_async
+from src.entities.user import UpcomingDatesResult, User
+from src.services.unique_actions import get_upcoming_dates
 
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class UserCreate(BaseModel):
     t_name: str
@@ -38,24 +40,45 @@ users_router = APIRouter(prefix="/users", tags=["users"])
 
 
 @users_router.get("")
-async def list_users(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, User)
+async def list_users(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, User, page)
+
+@users_router.get("/upcoming", response_model=UpcomingDatesResult)
+async def upcoming_dates(days: int = Query(30, ge=0, le=366), db: AsyncConnection = Depends(get_read_db), _=Depends(require_admin)):
+    """ birthdays and release dates in the next `days` days; admin-only like the users list """
+    return await get_upcoming_dates(db, days)
 
 @users_router.post("")
 async def create_user(payload: UserCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    payload.password_hash = hash_password(payload.password_hash)
+    payload.password_hash = await hash_password_async(payload.password_hash)
     return await create_one(db, User, payload)
 
-@users_router.patch("/{t_name}")
-async def update_user(t_name: str, payload: UserUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    result = await db.execute(select(User).where(User.t_name == t_name))
-    user = result.scalar_one_or_none()
+@users_router.post("/bulk")
+async def bulk_users(payload: BulkPayload[UserCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    # same rule as update_user: only hash a password that differs from the stored hash
+    changed = [row for row in payload.update if row.get("password_hash")]
+    if changed:
+        res = await db.execute(select(User.t_name, User.password_hash).where(User.t_name.in_([row.get("t_name") for row in changed])))
+        stored = dict(res.all())
+        changed = [row for row in changed if row["password_hash"] != stored.get(row.get("t_name"))]
 
-    if not user:
-        raise SystemError(404, "User not found")
+    # all at once: the hash pool runs them on every worker instead of one after another
+    hashes = await asyncio.gather(*[hash_password_async(row.password_hash) for row in payload.create],
+                                  *[hash_password_async(row["password_hash"]) for row in changed])
+    for row, h in zip(payload.create, hashes):
+        row.password_hash = h
+    for row, h in zip(changed, hashes[len(payload.create):]):
+        row["password_hash"] = h
 
-    if payload.password_hash and payload.password_hash != user.password_hash:
-        payload.password_hash = hash_password(payload.password_hash)
+    return await bulk_apply(db, User, payload, UserUpdate)
+
+@users_router.patch("/{t_name}")
+async def update_user(t_name: str, payload: UserUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    # the admin table sends the stored hash back unchanged; only hash a value that differs from it
+    if payload.password_hash:
+        stored = await db.scalar(select(User.password_hash).where(User.t_name == t_name))
+        if payload.password_hash != stored:
+            payload.password_hash = await hash_password_async(payload.password_hash)
     return await update_one(db, User, t_name, payload)
 
 @users_router.delete("/{t_name}")
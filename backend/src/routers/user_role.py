@@ -12,7 +12,7 @@ from src.db import get_db
 
 from src.entities.user_role import UserRole
 
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class UserRoleCreate(BaseModel):
     user_t_name: str
@@ -26,13 +26,17 @@ user_roles_router = APIRouter(prefix="/user_roles", tags=["user_roles"])
 
 
 @user_roles_router.get("")
-async def list_user_roles(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, UserRole)
+async def list_user_roles(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, UserRole, page)
 
 @user_roles_router.post("")
 async def create_user_role(payload: UserRoleCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, UserRole, payload)
 
+@user_roles_router.post("/bulk")
+async def bulk_user_roles(payload: BulkPayload[UserRoleCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, UserRole, payload, UserRoleUpdate)
+
 @user_roles_router.patch("/{user_t_name}/{role_name}")
 async def update_user_role(user_t_name: str, role_name: str, payload: UserRoleUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     pk = {"user_t_name": user_t_name, "role_name": role_name}
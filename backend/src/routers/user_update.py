@@ -1,17 +1,20 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta, timezone
+from typing import List
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.auth.deps import require_admin
-from src.db import get_db
+from src.db import get_db, get_read_db
 
-from src.entities.user_update import UserUpdate
+from src.entities.system_error import SystemError
+from src.entities.user_update import UserUpdate, UserUpdateResult
+from src.services.unique_actions import LOCAL_TZ, get_active_user_updates
 
-from src.services.common_actions import (list_all, create_one, update_one, delete_one)
+from src.services.common_actions import (ListParams, BulkPayload, list_all, create_one, update_one, delete_one, bulk_apply)
 
 class UserUpdateCreate(BaseModel):
     user_t_name: str
@@ -28,13 +31,32 @@ user_updates_router = APIRouter(prefix="/user_updates", tags=["user_updates"])
 
 
 @user_updates_router.get("")
-async def list_user_updates(db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
-    return await list_all(db, UserUpdate)
+async def list_user_updates(page: ListParams = Depends(), db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await list_all(db, UserUpdate, page)
+
+@user_updates_router.get("/active", response_model=List[UserUpdateResult])
+async def active_user_updates(
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+    limit: int = Query(1000, ge=1, le=5000),
+    db: AsyncConnection = Depends(get_read_db),
+    _=Depends(require_admin),
+):
+    """ updates overlapping [from, to); defaults to the coming week. Naive datetimes are portal-local time """
+    start = from_.replace(tzinfo=from_.tzinfo or LOCAL_TZ) if from_ else datetime.now(timezone.utc)
+    end = to.replace(tzinfo=to.tzinfo or LOCAL_TZ) if to else start + timedelta(days=7)
+    if end <= start:
+        raise SystemError(400, "'to' must be after 'from'")
+    return await get_active_user_updates(db, start, end, limit)
 
 @user_updates_router.post("")
 async def create_user_update(payload: UserUpdateCreate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await create_one(db, UserUpdate, payload)
 
+@user_updates_router.post("/bulk")
+async def bulk_user_updates(payload: BulkPayload[UserUpdateCreate], db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
+    return await bulk_apply(db, UserUpdate, payload, UserUpdateUpdate)
+
 @user_updates_router.patch("/{id}")
 async def update_user_update(id: int, payload: UserUpdateUpdate, db: AsyncSession = Depends(get_db), _=Depends(require_admin)):
     return await update_one(db, UserUpdate, id, payload)
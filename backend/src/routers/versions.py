@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Dict
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.db import get_read_db
+from src.services.versions import load_versions
+
+versions_router = APIRouter(prefix="/versions", tags=["system"])
+
+
+@versions_router.get("", response_model=Dict[str, int])
+async def table_versions(db: AsyncConnection = Depends(get_read_db)):
+    """ {table: change version}; a client refetches a table only when its number moved """
+    return await load_versions(db)
@@ -0,0 +1,204 @@
+# src/services/calendar.py
+# iCalendar feed (GET /api/calendar.ics): forum slots, cleaning duties and birthdays.
+# Built from three pre-rendered VEVENT lists, one per source, each re-rendered only when its
+# own tables change. A feed is those fragments filtered to a scope and joined, cached as bytes
+# per scope. Calendar apps poll every few minutes; almost every poll is a dict lookup.
+# Calendar apps can't log in, so a feed URL carries a signed token for its scope (feed_token);
+# links are handed out by GET /api/calendar/link to the user themself, or to an admin.
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.token import SECRET
+from src.entities.cleaning_duties import CleaningDuty
+from src.entities.forum_settings import ForumScheduleResult
+from src.entities.system_error import SystemError
+from src.entities.team import Team
+from src.entities.user import User
+from src.services.http_cache import strong_etag
+from src.services.unique_actions import get_cached_forum_schedule
+from src.services.versions import versions_of
+
+CALENDAR_NAME = os.getenv("CALENDAR_NAME", "Portal")
+CALENDAR_CACHE_MAX = int(os.getenv("CALENDAR_CACHE_MAX", "1024"))
+CALENDAR_REFRESH = "PT15M"   # polling hint for clients (REFRESH-INTERVAL / X-PUBLISHED-TTL)
+UID_DOMAIN = "portal"
+# rotating it revokes every calendar link handed out so far
+CALENDAR_SECRET = os.getenv("CALENDAR_SECRET", SECRET)
+_MAC = hmac.new(("calendar:" + CALENDAR_SECRET).encode("utf-8"), digestmod=hashlib.sha256)
+
+
+# ---- feed links ----
+
+def feed_scope(team: Optional[str] = None, user: Optional[str] = None) -> str:
+    return f"user:{user}" if user else f"team:{team}" if team else "all"
+
+def feed_token(scope: str) -> str:
+    mac = _MAC.copy()
+    mac.update(scope.encode("utf-8"))
+    return mac.hexdigest()[:32]
+
+def check_feed_token(scope: str, token: Optional[str]) -> None:
+    if not token or not hmac.compare_digest(feed_token(scope), token):
+        raise SystemError(403, "Invalid calendar link")
+
+
+# ---- iCalendar text (RFC 5545) ----
+
+def _escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+def _fold(line: str) -> str:
+    # content lines are at most 75 octets; continuation lines start with a space
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:   # don't split a UTF-8 sequence
+            end -= 1
+        parts.append(raw[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts)
+
+def _utc(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+def _day(d: date) -> str:
+    return d.strftime("%Y%m%d")
+
+def _vevent(uid: str, stamp: str, summary: str, *props: str) -> bytes:
+    lines = ["BEGIN:VEVENT", f"UID:{uid}@{UID_DOMAIN}", f"DTSTAMP:{stamp}", *props, f"SUMMARY:{_escape(summary)}", "END:VEVENT"]
+    return "".join(_fold(l) + "\r\n" for l in lines).encode("utf-8")
+
+
+# ---- per-source fragments ----
+
+@dataclass(frozen=True)
+class _Slot:
+    team_name: str
+    event: bytes
+
+@dataclass(frozen=True)
+class _Duty:
+    names: FrozenSet[str]
+    event: bytes
+
+@dataclass(frozen=True)
+class _Person:
+    t_name: str
+    name: str
+    team_name: Optional[str]
+    event: Optional[bytes]   # yearly birthday, None without a birthday
+
+# source -> (generation it was rendered at, items)
+_slots: Tuple[object, List[_Slot]] = (None, [])
+_duties: Tuple[object, List[_Duty]] = (None, [])
+_people: Tuple[object, List[_Person]] = (None, [])
+
+def _render_slots(schedule: List[ForumScheduleResult], stamp: str) -> List[_Slot]:
+    return [
+        _Slot(s.team_name, _vevent(
+            f"forum-{s.id}" if s.source == "override" else f"forum-{s.team_name}-{_utc(s.date_time)}", stamp,
+            f"Forum: {s.name} ({s.team_name})",
+            f"DTSTART:{_utc(s.date_time)}", f"DTEND:{_utc(s.date_time + timedelta(minutes=s.minute_length))}",
+        ))
+        for s in schedule
+    ]
+
+async def _load_duties(db: AsyncSession, stamp: str) -> List[_Duty]:
+    res = await db.execute(select(CleaningDuty.id, CleaningDuty.name1, CleaningDuty.name2, CleaningDuty.start_date, CleaningDuty.end_date))
+    out = []
+    for id, name1, name2, start, end in res:
+        if start is None:
+            continue
+        names = [n for n in (name1, name2) if n]
+        out.append(_Duty(frozenset(names), _vevent(
+            f"cleaning-{id}", stamp, f"Cleaning: {' & '.join(names)}",
+            f"DTSTART;VALUE=DATE:{_day(start)}", f"DTEND;VALUE=DATE:{_day((end or start) + timedelta(days=1))}",   # DTEND is exclusive
+            "TRANSP:TRANSPARENT",
+        )))
+    return out
+
+async def _load_people(db: AsyncSession, stamp: str) -> List[_Person]:
+    res = await db.execute(select(User.t_name, User.name, User.team_name, User.birthday))
+    return [
+        _Person(t_name, name, team_name, birthday and _vevent(
+            f"birthday-{t_name}", stamp, f"Birthday: {name}",
+            f"DTSTART;VALUE=DATE:{_day(birthday)}", f"DTEND;VALUE=DATE:{_day(birthday + timedelta(days=1))}",
+            "RRULE:FREQ=YEARLY", "TRANSP:TRANSPARENT",
+        ))
+        for t_name, name, team_name, birthday in res
+    ]
+
+
+# ---- feeds ----
+
+# (scope, name) -> (body, etag, generations)
+_feeds: Dict[Tuple[str, Optional[str]], Tuple[bytes, str, Tuple[object, ...]]] = {}
+
+def _calendar(title: str, events: List[bytes]) -> bytes:
+    head = "".join(_fold(l) + "\r\n" for l in (
+        "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:-//{UID_DOMAIN}//calendar//EN", "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(title)}", f"REFRESH-INTERVAL;VALUE=DURATION:{CALENDAR_REFRESH}", f"X-PUBLISHED-TTL:{CALENDAR_REFRESH}",
+    )).encode("utf-8")
+    return head + b"".join(events) + b"END:VCALENDAR\r\n"
+
+async def get_calendar(db: AsyncSession, team: Optional[str] = None, user: Optional[str] = None) -> Tuple[bytes, str]:
+    """ (text/calendar body, ETag) for everyone, one team, or one user (their team's forums, their duties, their own birthday) """
+    global _slots, _duties, _people
+    stamp = _utc(datetime.now(timezone.utc))
+    schedule, schedule_etag = await get_cached_forum_schedule(db)   # also refreshes the table versions
+    if _slots[0] != schedule_etag:
+        _slots = (schedule_etag, _render_slots(schedule, stamp))
+    duties_gen = versions_of(("cleaning_duties",))
+    if _duties[0] != duties_gen:
+        _duties = (duties_gen, await _load_duties(db, stamp))
+    people_gen = versions_of(("users",))
+    if _people[0] != people_gen:
+        _people = (people_gen, await _load_people(db, stamp))
+
+    key = ("user", user) if user else ("team", team) if team else ("all", None)
+    generations = (_slots[0], _duties[0], _people[0])
+    hit = _feeds.get(key)
+    if hit and hit[2] == generations:
+        return hit[0], hit[1]
+
+    slots, duties, people = _slots[1], _duties[1], _people[1]
+    if user:
+        me = next((p for p in people if p.t_name == user), None)
+        if me is None:
+            raise SystemError(404, "User not found")
+        team = me.team_name
+        members = [me]   # other people's birthdays only go to admin-issued team / everyone links
+        mine = {me.name, me.t_name}
+        events = [s.event for s in slots if s.team_name == team] + [d.event for d in duties if d.names & mine]
+        title = f"{CALENDAR_NAME} - {me.name}"
+    elif team:
+        if not await db.scalar(select(Team.name).where(Team.name == team)):
+            raise SystemError(404, "Team not found")
+        members = [p for p in people if p.team_name == team]
+        names = {n for p in members for n in (p.name, p.t_name)}
+        events = [s.event for s in slots if s.team_name == team] + [d.event for d in duties if d.names & names]
+        title = f"{CALENDAR_NAME} - {team}"
+    else:
+        members = people
+        events = [s.event for s in slots] + [d.event for d in duties]
+        title = CALENDAR_NAME
+    events += [p.event for p in members if p.event]
+
+    body = _calendar(title, events)
+    etag = strong_etag(body)
+    if len(_feeds) >= CALENDAR_CACHE_MAX:
+        _feeds.clear()
+    _feeds[key] = (body, etag, generations)
+    return body, etag
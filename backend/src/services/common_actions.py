@@ -1,59 +1,157 @@
 # src/services/crud.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Type, TypeVar
-from sqlalchemy import select, inspect
-from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Generic, List, Literal, Optional, Tuple, Type, TypeVar
+from fastapi import Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, column, delete, insert, select, inspect, tuple_, update, values
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.exc import IntegrityError
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 
 from src.entities.system_error import SystemError
+from src.services.serialization import dumps, json_response
 
 T = TypeVar("T")
+CreateT = TypeVar("CreateT", bound=BaseModel)
 
-class ListAllResult(BaseModel):
-    items: List[Dict[str, Any]]
-    columns: List[str]
-    primary_keys: List[str]
+LIST_DEFAULT_LIMIT = int(os.getenv("LIST_DEFAULT_LIMIT", "500"))
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "5000"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "5000"))
 
-async def list_all(db: AsyncSession, Model: Type[T]) -> ListAllResult:
+class ListParams:
+    """ query params shared by every generic list endpoint (?limit=&after=&stream=&format=) """
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_LIMIT),
+        after: Optional[str] = Query(None),
+        stream: bool = Query(False),
+        output_format: Literal["objects", "columns"] = Query("objects", alias="format"),
+    ):
+        self.limit = limit
+        self.after = after
+        self.stream = stream
+        self.output_format = output_format
+
+# list_all response (encoded straight to bytes, no pydantic round trip):
+#   format=objects: {"items": [{col: value, ...}], "columns", "primary_keys", "next_after"}
+#   format=columns: {"rows": [[value, ...]], "columns", "primary_keys", "next_after"}  - no repeated keys
+# next_after: opaque cursor (the last row's PK), pass back as ?after= to get the next page (null on the last page).
+#   A page holds at most LIST_DEFAULT_LIMIT rows unless ?limit= asks otherwise, so clients follow it to the end.
+async def list_all(db: AsyncSession | AsyncConnection, Model: Type[T], params: Optional[ListParams] = None) -> Response:
     mapper = inspect(Model)
-    columns = [c.key for c in mapper.columns]
-    pk_cols = [c.key for c in mapper.primary_key]
+    columns = [c.key for c in mapper.column_attrs]
+    pk_cols = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+    params = params or ListParams(limit=None, after=None, stream=False, output_format="objects")
+
+    # select plain columns (no ORM identities), ordered by PK so the PK can be used as a cursor
+    pk_attrs = [getattr(Model, k) for k in pk_cols]
+    stmt = select(*[getattr(Model, c) for c in columns]).order_by(*pk_attrs)
+    if params.after is not None:
+        stmt = stmt.where(_after_clause(mapper, pk_attrs, params.after))
+
+    if params.stream:
+        if params.limit is not None:
+            stmt = stmt.limit(params.limit)
+        return StreamingResponse(_stream_ndjson(db, stmt, columns), media_type="application/x-ndjson")
+
+    limit = params.limit or LIST_DEFAULT_LIMIT
+    res = await db.execute(stmt.limit(limit + 1))   # one extra row tells us if there is a next page
+    rows = res.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_after = None
+    if has_more:
+        pk_idx = [columns.index(k) for k in pk_cols]
+        next_after = _encode_cursor([rows[-1][i] for i in pk_idx])
+
+    body: Dict[str, Any] = {"columns": columns, "primary_keys": pk_cols, "next_after": next_after}
+    if params.output_format == "columns":
+        body["rows"] = [tuple(row) for row in rows]
+    else:
+        body["items"] = [dict(zip(columns, row)) for row in rows]
+    return json_response(body)
+
+def _coerce_pk(mapper, pk_values) -> Tuple[Any, ...]:
+    # path/query/JSON values -> the python type of each primary key column
+    if len(pk_values) != len(mapper.primary_key):
+        raise ValueError("wrong number of primary key values")
+    return tuple(col.type.python_type(v) for col, v in zip(mapper.primary_key, pk_values))
+
+def _encode_cursor(pk_values: List[Any]) -> str:
+    # base64url JSON of the PK values as strings: any character in a key survives the round trip
+    raw = json.dumps([str(v) for v in pk_values], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def _decode_cursor(after: str) -> List[Any]:
+    try:
+        parts = json.loads(base64.urlsafe_b64decode(after + "=" * (-len(after) % 4)))
+    except ValueError:   # bad base64, UTF-8 and JSON all raise ValueError subclasses
+        raise SystemError(422, "Invalid cursor")
+    if not isinstance(parts, list) or not all(isinstance(p, str) for p in parts):
+        raise SystemError(422, "Invalid cursor")
+    return parts
+
+def _after_clause(mapper, pk_attrs, after: str):
+    parts = _decode_cursor(after)
+    if len(parts) != len(pk_attrs):
+        raise SystemError(422, "Invalid cursor")
+    try:
+        values = _coerce_pk(mapper, parts)
+    except (TypeError, ValueError):
+        raise SystemError(422, "Invalid cursor")
+
+    if len(pk_attrs) == 1:
+        return pk_attrs[0] > values[0]
+    return tuple_(*pk_attrs) > tuple_(*values)
 
-    res = await db.execute(select(Model))
-    objs = list(res.scalars().all())
-    items = [ {col: getattr(obj, col) for col in columns} for obj in objs ]
+async def _stream_ndjson(db: AsyncSession | AsyncConnection, stmt, columns: List[str]) -> AsyncIterator[bytes]:
+    # server-side cursor: rows are pulled from the DB in chunks, never all in memory
+    res = await db.stream(stmt.execution_options(yield_per=500))
+    async for row in res:
+        yield dumps(dict(zip(columns, row))) + b"\n"
 
-    return ListAllResult(items=items, columns=columns, primary_keys=pk_cols)
+# Single-row writes are one statement each (INSERT/UPDATE/DELETE ... RETURNING) plus the commit:
+# no SELECT before the write and no refresh after it. They return the row as a dict.
 
-async def create_one(db: AsyncSession, Model: Type[T], payload: BaseModel) -> T:
-    obj = Model(**payload.model_dump())
-    db.add(obj)
+def _pk_where(Model: Type[T], pk: int|str|Dict[str, Any]):
+    mapper = inspect(Model)
+    pk_cols = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+    pk_values = [pk[k] for k in pk_cols] if isinstance(pk, dict) else [pk]
+    return _pk_clause(mapper, pk_cols, pk_values)
+
+async def create_one(db: AsyncSession, Model: Type[T], payload: BaseModel) -> Dict[str, Any]:
+    table = Model.__table__
     try:
-        await db.commit()      # upload session changes to DB
-        await db.refresh(obj)  # update obj with DB changes
-        return obj             # return the created DB object
+        res = await db.execute(insert(table).values(**payload.model_dump()).returning(*table.c))
+        row = dict(res.one()._mapping)
+        await db.commit()
+        return row
     except IntegrityError as e:
         await db.rollback()    # deletes session changes
         status, msg = _translate_error(e)
         raise SystemError(status, msg)
 
 
-async def update_one(db: AsyncSession, Model: Type[T], pk: int|str|Dict[str, Any], payload: BaseModel) -> T: 
-    obj = await db.get(Model, pk)
-    if not obj:
-        raise SystemError(404, "Row not found")
-
-    # set attrs that exist
-    for k, v in payload.model_dump().items():
-        if hasattr(obj, k):
-            setattr(obj, k, v)
+async def update_one(db: AsyncSession, Model: Type[T], pk: int|str|Dict[str, Any], payload: BaseModel) -> Dict[str, Any]:
+    table = Model.__table__
+    where = _pk_where(Model, pk)
+    data = payload.model_dump(exclude_unset=True)   # PATCH: only the fields the client sent
+    data = {k: v for k, v in data.items() if k in table.c}
 
+    stmt = update(table).where(where).values(**data).returning(*table.c) if data else select(*table.c).where(where)
     try:
-        await db.commit()
-        await db.refresh(obj)
-        return obj
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            await db.rollback()
+            raise SystemError(404, "Row not found")
+        if data:
+            await db.commit()   # nothing to commit for an empty PATCH: that was a plain read
+        return dict(row._mapping)
     except IntegrityError as e:
         await db.rollback()
         status, msg = _translate_error(e)
@@ -61,17 +159,166 @@ async def update_one(db: AsyncSession, Model: Type[T], pk: int|str|Dict[str, Any
 
 
 async def delete_one(db: AsyncSession, Model: Type[T], pk: int|str|Dict[str, Any]) -> None:
-    obj = await db.get(Model, pk)
-    if not obj:
-        raise SystemError(404, "Row not found")
-
-    await db.delete(obj)
+    table = Model.__table__
     try:
-        await db.commit()
+        deleted = (await db.execute(delete(table).where(_pk_where(Model, pk)).returning(*table.primary_key.columns))).first()
     except Exception as e:
         await db.rollback()
         raise SystemError(400, f"Delete failed: {str(e)}")
 
+    if deleted is None:
+        await db.rollback()
+        raise SystemError(404, "Row not found")
+    await db.commit()
+
+class BulkPayload(BaseModel, Generic[CreateT]):
+    create: List[CreateT] = Field(default_factory=list, max_length=BULK_MAX_ROWS)
+    update: List[Dict[str, Any]] = Field(default_factory=list, max_length=BULK_MAX_ROWS)  # primary key fields + fields to change
+    delete: List[Any] = Field(default_factory=list, max_length=BULK_MAX_ROWS)             # primary key values (a dict for composite keys)
+
+class BulkResult(BaseModel):
+    created: List[Dict[str, Any]]
+    updated: List[Dict[str, Any]]
+    deleted: List[Any]
+
+RowErrors = List[Dict[str, Any]]
+
+def _row_error(op: str, index: int, status: int, msg: str) -> Dict[str, Any]:
+    # same shape as FastAPI validation errors, so the frontend shows them the same way
+    return {"loc": ["body", op, index], "msg": f"{op}[{index}]: {msg}", "status": status}
+
+def _row_index(error: Dict[str, Any]) -> int:
+    return error["loc"][2] if len(error["loc"]) > 2 else -1
+
+async def _diagnose(db: AsyncSession, op: str, row_stmts: List[Any], failure: IntegrityError) -> RowErrors:
+    # the set-based statement failed: replay row by row in savepoints to find the offending rows.
+    # The replay only diagnoses, it is always rolled back, and it never comes back empty: if no
+    # single row fails on its own, the statement's own error is reported for the whole op.
+    errors = []
+    replay = await db.begin_nested()
+    try:
+        for i, stmt in enumerate(row_stmts):
+            try:
+                async with db.begin_nested():
+                    await db.execute(stmt)
+            except IntegrityError as e:
+                status, msg = _translate_error(e)
+                errors.append(_row_error(op, i, status, msg))
+    finally:
+        await replay.rollback()
+    if not errors:
+        status, msg = _translate_error(failure)
+        errors.append({"loc": ["body", op], "msg": f"{op}: {msg}", "status": status})
+    return errors
+
+def _pk_clause(mapper, pk_cols: List[str], pk_values: Tuple[Any, ...]):
+    return and_(*[mapper.columns[k] == v for k, v in zip(pk_cols, pk_values)])
+
+async def create_many(db: AsyncSession, Model: Type[T], payloads: List[BaseModel]) -> Tuple[List[Dict[str, Any]], RowErrors]:
+    """ multi-row INSERT ... RETURNING; does not commit """
+    if not payloads:
+        return [], []
+    table = Model.__table__
+    rows = [p.model_dump() for p in payloads]
+    try:
+        async with db.begin_nested():
+            res = await db.execute(insert(table).returning(*table.c, sort_by_parameter_order=True), rows)
+            return [dict(r._mapping) for r in res], []
+    except IntegrityError as e:
+        return [], await _diagnose(db, "create", [insert(table).values(row) for row in rows], e)
+
+async def update_many(db: AsyncSession, Model: Type[T], rows: List[Dict[str, Any]], UpdateModel: Type[BaseModel]) -> Tuple[List[Dict[str, Any]], RowErrors]:
+    """ one UPDATE ... FROM (VALUES ...) RETURNING per distinct set of changed fields; does not commit """
+    mapper = inspect(Model)
+    table = Model.__table__
+    pk_cols = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+    errors: RowErrors = []
+
+    # validate and group rows by the fields they change (PATCH semantics: only fields that were sent)
+    groups: Dict[Tuple[str, ...], List[Tuple[int, Tuple[Any, ...], Dict[str, Any]]]] = {}
+    for i, row in enumerate(rows):
+        try:
+            pk = _coerce_pk(mapper, [row[k] for k in pk_cols])
+        except (KeyError, TypeError, ValueError):
+            errors.append(_row_error("update", i, 422, f"Missing or invalid primary key {pk_cols}"))
+            continue
+        try:
+            fields = UpdateModel.model_validate({k: v for k, v in row.items() if k not in pk_cols}).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            errors.append(_row_error("update", i, 422, "; ".join(err["msg"] for err in e.errors())))
+            continue
+        if fields:
+            groups.setdefault(tuple(sorted(fields)), []).append((i, pk, fields))
+
+    updated = []
+    for keys, group in groups.items():
+        v = values(*[column(k, mapper.columns[k].type) for k in pk_cols + list(keys)], name="v").data(
+            [pk + tuple(fields[k] for k in keys) for _, pk, fields in group]
+        )
+        stmt = (
+            update(table)
+            .where(and_(*[mapper.columns[k] == v.c[k] for k in pk_cols]))
+            .values({k: v.c[k] for k in keys})
+            .returning(*table.c)
+        )
+        try:
+            async with db.begin_nested():
+                res = [dict(r._mapping) for r in await db.execute(stmt)]
+        except IntegrityError as e:
+            errors += await _diagnose(db, "update", [update(table).where(_pk_clause(mapper, pk_cols, pk)).values(fields) for _, pk, fields in group], e)
+            continue
+
+        found = {tuple(r[k] for k in pk_cols) for r in res}
+        errors += [_row_error("update", i, 404, "Row not found") for i, pk, _ in group if pk not in found]
+        updated += res
+    return updated, errors
+
+async def delete_many(db: AsyncSession, Model: Type[T], pks: List[Any]) -> Tuple[List[Any], RowErrors]:
+    """ DELETE ... WHERE pk IN (...) RETURNING pk; does not commit """
+    if not pks:
+        return [], []
+    mapper = inspect(Model)
+    table = Model.__table__
+    pk_cols = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+
+    errors: RowErrors = []
+    keyed: List[Tuple[int, Tuple[Any, ...]]] = []
+    for i, pk in enumerate(pks):
+        try:
+            keyed.append((i, _coerce_pk(mapper, [pk[k] for k in pk_cols] if isinstance(pk, dict) else [pk])))
+        except (KeyError, TypeError, ValueError):
+            errors.append(_row_error("delete", i, 422, f"Expected primary key {pk_cols}"))
+    if not keyed:
+        return [], errors
+
+    pk_attrs = [mapper.columns[k] for k in pk_cols]
+    where = pk_attrs[0].in_([pk[0] for _, pk in keyed]) if len(pk_cols) == 1 else tuple_(*pk_attrs).in_([pk for _, pk in keyed])
+    try:
+        async with db.begin_nested():
+            res = await db.execute(delete(table).where(where).returning(*pk_attrs))
+            found = {tuple(r) for r in res}
+    except IntegrityError as e:
+        errors += await _diagnose(db, "delete", [delete(table).where(_pk_clause(mapper, pk_cols, pk)) for _, pk in keyed], e)
+        return [], errors
+
+    errors += [_row_error("delete", i, 404, "Row not found") for i, pk in keyed if pk not in found]
+    deleted = [pk[0] if len(pk_cols) == 1 else dict(zip(pk_cols, pk)) for _, pk in keyed if pk in found]
+    return deleted, errors
+
+async def bulk_apply(db: AsyncSession, Model: Type[T], payload: BulkPayload, UpdateModel: Type[BaseModel]) -> BulkResult:
+    """ creates, updates and deletes in one transaction: all rows succeed or nothing is written """
+    created, create_errors = await create_many(db, Model, payload.create)
+    updated, update_errors = await update_many(db, Model, payload.update, UpdateModel)
+    deleted, delete_errors = await delete_many(db, Model, payload.delete)
+
+    errors = sorted(create_errors, key=_row_index) + sorted(update_errors, key=_row_index) + sorted(delete_errors, key=_row_index)
+    if errors:
+        await db.rollback()
+        raise SystemError(max(e["status"] for e in errors), errors)
+
+    await db.commit()
+    return BulkResult(created=created, updated=updated, deleted=deleted)
+
 def _translate_error(e: IntegrityError):
     orig = getattr(e, "orig", None)
     inner = getattr(orig, "orig", None) or getattr(orig, "__cause__", None) or orig
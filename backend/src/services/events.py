@@ -0,0 +1,168 @@
+# src/services/events.py
+# Live change feed for GET /api/stream.
+# Row triggers (migration 3) pg_notify every committed change to CHANNEL. One asyncpg connection
+# per process LISTENs to it and fans the events out to the connected SSE clients through EventHub.
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.auth.token import SECRET
+from src.db import DATABASE_URL
+from src.entities.system_error import SystemError
+from src.services.serialization import dumps
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "portal_changes"
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))   # events buffered per client before it is resynced
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "1000"))
+
+RESYNC = {"table": "*", "op": "RESYNC"}   # "you missed events, reload what you show"
+
+# EventSource can't send headers, so browsers connect with ?ticket= instead of their bearer token:
+# only good for opening a stream, and only for STREAM_TICKET_TTL seconds, so a URL that ends up in
+# an access log or the browser history is useless soon after.
+STREAM_TICKET_TTL = int(os.getenv("STREAM_TICKET_TTL", "60"))
+_TICKET_MAC = hmac.new(("stream:" + SECRET).encode("utf-8"), digestmod=hashlib.sha256)
+
+def _ticket_sig(body: str) -> str:
+    mac = _TICKET_MAC.copy()
+    mac.update(body.encode("utf-8"))
+    return mac.hexdigest()[:32]
+
+def stream_ticket(t_name: str) -> str:
+    body = f"{int(time.time()) + STREAM_TICKET_TTL}.{t_name}"
+    return f"{body}.{_ticket_sig(body)}"
+
+def check_stream_ticket(ticket: str) -> str:
+    """ the t_name the ticket was issued to """
+    body, _, sig = ticket.rpartition(".")
+    exp, _, t_name = body.partition(".")
+    if not body or not hmac.compare_digest(_ticket_sig(body), sig) or not exp.isdigit() or int(exp) < time.time():
+        raise SystemError(403, "Invalid or expired stream ticket")
+    return t_name
+
+
+class Subscriber:
+    def __init__(self, tables: Optional[Set[str]]):
+        self.tables = tables   # None = every table
+        self.queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """ never blocks the publisher: a client that fell behind gets its backlog replaced by one RESYNC """
+        if event is not RESYNC and self.tables is not None and event["table"] not in self.tables:
+            return True
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+
+class EventHub:
+    def __init__(self):
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.resyncs = 0
+
+    def subscribe(self, tables: Optional[Set[str]] = None) -> Subscriber:
+        sub = Subscriber(tables)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self.subscribers.discard(sub)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self.published += 1
+        for sub in list(self.subscribers):
+            if not sub.offer(event):
+                self.resyncs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.subscribers),
+            "published": self.published,
+            "resyncs": self.resyncs,
+            "listening": _listener is not None and not _listener.done(),
+        }
+
+hub = EventHub()
+
+
+def _on_notify(_conn, _pid, _channel, payload: str) -> None:
+    try:
+        hub.publish(json.loads(payload))
+    except ValueError:
+        log.warning("bad %s payload: %.200s", CHANNEL, payload)
+
+async def _listen_forever() -> None:
+    # plain asyncpg connection, outside the SQLAlchemy pool: it is held for the life of the process
+    dsn = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    delay = 1.0
+    while True:
+        try:
+            conn = await asyncpg.connect(dsn)
+            try:
+                await conn.add_listener(CHANNEL, _on_notify)
+                hub.publish(RESYNC)   # anything committed while we were not listening is lost
+                delay = 1.0
+                while not conn.is_closed():
+                    await asyncio.sleep(STREAM_HEARTBEAT_SECONDS)
+                    await conn.execute("SELECT 1")
+            finally:
+                await conn.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("change listener lost (%s), reconnecting in %.0fs", e, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+_listener: Optional[asyncio.Task] = None
+
+def start_listener() -> None:
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.get_running_loop().create_task(_listen_forever())
+
+async def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
+
+
+async def sse_stream(tables: Set[str]) -> AsyncIterator[bytes]:
+    """ text/event-stream body for one client; subscribes on the first chunk, so a client that
+    leaves before the body starts never holds a slot, and unsubscribes when the client goes away """
+    sub = hub.subscribe(tables)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"   # keeps proxies from closing an idle connection
+                continue
+            yield b"event: change\ndata: " + dumps(event) + b"\n\n"
+    finally:
+        hub.unsubscribe(sub)
@@ -0,0 +1,17 @@
+# src/services/http_cache.py
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # weak comparison (RFC 9110 13.1.2): W/"x" matches "x" - what If-None-Match on GET uses
+    if not if_none_match:
+        return False
+    etag = etag.removeprefix("W/")
+    candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,198 @@
+# src/services/metrics.py
+# In-process request metrics, rendered in Prometheus text format by GET /api/metrics.
+# MetricsMiddleware (src/middleware.py) opens a RequestStats per request; the SQLAlchemy hooks
+# and timed() add to it. With METRICS_ENABLED=0 nothing is installed and timed() is a no-op.
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+log = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")                        # scrapers send "Bearer <token>"; admins use their own token
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))  # same statement this many times in one request
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))   # fraction of requests run under cProfile (PUT /api/system/profiler)
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help, tuple(labels), tuple(buckets)
+        self.series: Dict[Tuple[str, ...], List[float]] = {}   # label values -> bucket counts + [sum, count]
+
+    def observe(self, value: float, *label_values: str) -> None:
+        s = self.series.get(label_values)
+        if s is None:
+            s = self.series[label_values] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                s[i] += 1
+        s[-2] += value
+        s[-1] += 1
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for values, s in self.series.items():
+            labels = _labels(self.labels, values)
+            for bound, n in zip(self.buckets, s):
+                yield f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound:g}"}} {n}'
+            yield f'{self.name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {s[-1]}'
+            yield f"{self.name}_sum{{{labels}}} {s[-2]:.6f}"
+            yield f"{self.name}_count{{{labels}}} {s[-1]}"
+
+
+class MetricCounter:
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, by: float = 1) -> None:
+        self.series[label_values] = self.series.get(label_values, 0) + by
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for values, n in self.series.items():
+            yield f"{self.name}{{{_labels(self.labels, values)}}} {n:g}"
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in zip(names, values))
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_seconds = Histogram("portal_request_duration_seconds", "Request latency by route", ("method", "route"))
+requests_total = MetricCounter("portal_requests_total", "Requests by route and status", ("method", "route", "status"))
+request_queries = Histogram("portal_request_db_queries", "SQL statements per request", ("route",), QUERY_BUCKETS)
+request_db_seconds = Histogram("portal_request_db_seconds", "Time spent in SQL per request", ("route",))
+n_plus_one_total = MetricCounter("portal_n_plus_one_total", f"Requests that ran one statement {N_PLUS_ONE_THRESHOLD}+ times", ("route",))
+phase_seconds = Histogram("portal_phase_seconds", "Time in instrumented phases (auth, pool_wait, json)", ("phase",))
+METRICS = [request_seconds, requests_total, request_queries, request_db_seconds, n_plus_one_total, phase_seconds]
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "statements", "phases")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: Counter[str] = Counter()
+        self.phases: Dict[str, float] = {}
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def begin_request() -> Tuple[RequestStats, Any]:
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+def end_request(stats: RequestStats, token: Any, method: str, route: str, status: int, seconds: float) -> None:
+    _current.reset(token)
+    request_seconds.observe(seconds, method, route)
+    requests_total.inc(method, route, str(status))
+    request_queries.observe(stats.queries, route)
+    request_db_seconds.observe(stats.db_seconds, route)
+    for phase, spent in stats.phases.items():
+        phase_seconds.observe(spent, phase)
+
+    statement, n = stats.statements.most_common(1)[0] if stats.statements else ("", 0)
+    if n >= N_PLUS_ONE_THRESHOLD:
+        n_plus_one_total.inc(route)
+        log.warning("possible N+1 on %s %s: %d x %.200s", method, route, n, statement)
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - start)
+
+def record_phase(phase: str, seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.phases[phase] = stats.phases.get(phase, 0.0) + seconds
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+        stats.statements[statement] += 1
+
+def _on_error(context) -> None:
+    # a statement that raises never reaches after_cursor_execute: drop its start time here
+    started = context.connection is not None and context.connection.info.get("query_start")
+    if context.execution_context is not None and started:
+        started.pop()
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    if METRICS_ENABLED:
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_execute)
+        event.listen(engine.sync_engine, "handle_error", _on_error)
+
+
+# Sampling profiler: cProfile sees the whole thread, so a sampled request's profile also
+# contains whatever other requests ran on the event loop meanwhile. One profile at a time.
+profiles: Deque[Dict[str, Any]] = deque(maxlen=PROFILE_KEEP)
+profile_rate = PROFILE_SAMPLE_RATE
+_profiling = False
+
+def set_profile_rate(rate: float) -> None:
+    global profile_rate
+    profile_rate = rate
+
+def start_profile() -> Optional[cProfile.Profile]:
+    global _profiling
+    if _profiling or not profile_rate or random.random() >= profile_rate:
+        return None
+    _profiling = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def finish_profile(profiler: cProfile.Profile, method: str, path: str, seconds: float) -> None:
+    global _profiling
+    profiler.disable()
+    _profiling = False
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(40)
+    profiles.append({"method": method, "path": path, "ms": round(seconds * 1000, 3), "at": time.time(), "stats": out.getvalue()})
+
+
+def render(gauges: Dict[str, float]) -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, value in gauges.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value:g}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,113 @@
+# src/services/search.py
+# Full-text search over messages and forum ideas (GET /api/search).
+# The tsvector columns are generated by Postgres (migration 7), so writes need no app code here.
+# A page is ranked on the GIN indexes first and only its rows are then fetched and highlighted:
+# ts_headline re-parses the whole text, which makes it the expensive part of a search.
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Sequence, Tuple
+
+from sqlalchemy import func, literal, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.entities.forum_idea import FORUM_IDEA_SEARCH, ForumIdea
+from src.entities.message import MESSAGE_SEARCH, Message
+from src.entities.search import SearchHit, SearchKind, SearchPage
+from src.services.http_cache import strong_etag
+from src.services.versions import load_versions, versions_of
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_MAX_OFFSET = 1000   # ranked results page by OFFSET, which gets slower the deeper it goes
+SEARCH_TABLES: Tuple[SearchKind, ...] = ("messages", "forum_ideas")
+
+# Private-use code points: they can't clash with anything people type, and the client turns
+# them into <mark> elements without ever treating the text as HTML.
+HIGHLIGHT_START, HIGHLIGHT_STOP = "\ue000", "\ue001"
+_MARKS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}"
+SNIPPET_OPTIONS = f'{_MARKS}, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "'
+TITLE_OPTIONS = f"{_MARKS}, HighlightAll=true"
+
+_ENGLISH = literal_column("'english'::regconfig")
+_SIMPLE = literal_column("'simple'::regconfig")
+
+# (query, kinds, limit, offset) -> (body, etag, versions); LRU, validated like the schedule cache
+_cache: "OrderedDict[Tuple[str, Tuple[str, ...], int, int], Tuple[bytes, str, Tuple[int, ...]]]" = OrderedDict()
+
+
+def _tsquery(q: str):
+    # both configs the vectors are built with; websearch syntax: "a phrase", or, -excluded
+    return func.websearch_to_tsquery(_ENGLISH, q).op("||")(func.websearch_to_tsquery(_SIMPLE, q))
+
+def _ranked(kind: SearchKind, query):
+    vector, id = (MESSAGE_SEARCH, Message.id) if kind == "messages" else (FORUM_IDEA_SEARCH, ForumIdea.id)
+    return (
+        select(literal(kind).label("kind"), id.label("id"), func.ts_rank_cd(vector, query).label("rank"))
+        .where(vector.op("@@")(query))
+    )
+
+async def _search(db: AsyncConnection, q: str, kinds: Sequence[SearchKind], limit: int, offset: int) -> SearchPage:
+    query = _tsquery(q)
+    parts = [_ranked(kind, query) for kind in kinds]
+    ranked = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+    stmt = (
+        select(ranked.c.kind, ranked.c.id, ranked.c.rank)
+        .order_by(ranked.c.rank.desc(), ranked.c.kind, ranked.c.id.desc())
+        .limit(limit + 1)
+        .offset(offset)
+    )
+    rows = (await db.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    details: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    message_ids = [r.id for r in rows if r.kind == "messages"]
+    if message_ids:
+        res = await db.execute(
+            select(
+                Message.id, Message.user_t_name, Message.date_time,
+                func.ts_headline(_ENGLISH, Message.title, query, TITLE_OPTIONS).label("title"),
+                func.ts_headline(_ENGLISH, Message.message, query, SNIPPET_OPTIONS).label("snippet"),
+            ).where(Message.id.in_(message_ids))
+        )
+        for r in res:
+            details["messages", r.id] = {**r._mapping, "team_name": None}
+    idea_ids = [r.id for r in rows if r.kind == "forum_ideas"]
+    if idea_ids:
+        res = await db.execute(
+            select(
+                ForumIdea.id, ForumIdea.user_t_name, ForumIdea.team_name,
+                func.ts_headline(_ENGLISH, ForumIdea.idea, query, SNIPPET_OPTIONS).label("snippet"),
+            ).where(ForumIdea.id.in_(idea_ids))
+        )
+        for r in res:
+            details["forum_ideas", r.id] = {**r._mapping, "title": None, "date_time": None}
+
+    items = [
+        SearchHit(kind=r.kind, rank=r.rank, **details[r.kind, r.id])
+        for r in rows if (r.kind, r.id) in details   # deleted between the two queries
+    ]
+    return SearchPage(query=q, items=items, next_offset=offset + limit if has_more else None)
+
+async def search(db: AsyncConnection, q: str, kinds: Sequence[SearchKind], limit: int, offset: int) -> Tuple[bytes, str]:
+    """ (JSON body, ETag); hot queries are served from memory until messages or forum_ideas change """
+    q = " ".join(q.split())
+    key = (q, tuple(kinds), limit, offset)
+    await load_versions(db)
+    versions = versions_of(SEARCH_TABLES)
+    hit = _cache.get(key)
+    if hit and hit[2] == versions:
+        _cache.move_to_end(key)
+        return hit[0], hit[1]
+
+    body = (await _search(db, q, kinds, limit, offset)).model_dump_json().encode("utf-8")
+    etag = strong_etag(body)
+    _cache[key] = (body, etag, versions)
+    _cache.move_to_end(key)
+    if len(_cache) > SEARCH_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return body, etag
+
+def clear_cache() -> None:
+    _cache.clear()
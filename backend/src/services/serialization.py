@@ -0,0 +1,34 @@
+# src/services/serialization.py
+# Rows straight to JSON bytes, skipping pydantic validation + jsonable_encoder.
+# Uses orjson (a declared dependency: several times faster, handles datetime/date natively);
+# an install without it falls back to the stdlib encoder, same output for our column types.
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import Response
+
+from src.services.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+
+def _default(v: Any):
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    raise TypeError(f"{type(v).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def json_response(obj: Any, status_code: int = 200) -> Response:
+    with timed("json"):
+        body = dumps(obj)
+    return Response(content=body, status_code=status_code, media_type="application/json")
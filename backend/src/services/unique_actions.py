@@ -1,36 +1,97 @@
 
 from __future__ import annotations
 
-from typing import List
-from datetime import datetime, timedelta, timezone
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from src.entities.team import Team
-from src.entities.team import Team
+import calendar
+import os
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy import DateTime, func, inspect, literal, or_, select, tuple_
+from sqlalchemy.orm import selectinload
+from src.entities.system_error import SystemError
+from src.entities.team import Team, TeamDashboardResult
 from src.entities.forum_settings import ForumScheduleResult, ForumSettings
 from src.entities.forum_idea import ForumIdea, ForumIdeaResult
 from src.entities.forum_event import ForumEvent, ForumEventResult
 from src.entities.team_link import TeamLink, TeamLinkResult
+from src.entities.user_update import USER_UPDATE_PERIOD, UserUpdate, UserUpdateResult
+from src.entities.message import Message, MessageFeedItem, MessageFeedPage
+from src.entities.user import BIRTHDAY_MMDD, UpcomingDateResult, UpcomingDatesResult, User
+from src.services.http_cache import strong_etag
+from src.services.serialization import dumps
+from src.services.versions import load_versions, versions_of
 from zoneinfo import ZoneInfo
 
 from datetime import datetime
 
 
-async def get_teams_links(db: AsyncSession, team_name: str) -> List[TeamLinkResult]:
-    stmt = select(TeamLink).where(TeamLink.team_name == team_name)
+def _columns(Model) -> list:
+    # plain column select: rows come back as tuples, no ORM identities to build or track
+    return [getattr(Model, c.key) for c in inspect(Model).column_attrs]
+
+async def get_teams_links(db: AsyncConnection, team_name: str) -> List[TeamLinkResult]:
+    stmt = select(*_columns(TeamLink)).where(TeamLink.team_name == team_name)
     res = await db.execute(stmt)
-    return [TeamLinkResult.model_validate(tl) for tl in res.scalars().all()]
+    return [TeamLinkResult.model_validate(row._mapping) for row in res]
 
-async def get_team_forum_ideas(db: AsyncSession, team_name: str) -> List[ForumIdeaResult]:
-    stmt = select(ForumIdea).where(ForumIdea.team_name == team_name).order_by(ForumIdea.id.desc())
+async def get_team_forum_ideas(db: AsyncConnection, team_name: str) -> List[ForumIdeaResult]:
+    stmt = select(*_columns(ForumIdea)).where(ForumIdea.team_name == team_name).order_by(ForumIdea.id.desc())
     res = await db.execute(stmt)
-    return res.scalars().all()
+    return [ForumIdeaResult.model_validate(row._mapping) for row in res]
 
-async def get_future_forum_events(db: AsyncSession) -> List[ForumEventResult]:
+async def get_future_forum_events(db: AsyncConnection) -> List[ForumEventResult]:
     now = datetime.now(timezone.utc)
-    stmt = select(ForumEvent).where(ForumEvent.date_time > now).order_by(ForumEvent.date_time.asc())
+    stmt = select(*_columns(ForumEvent)).where(ForumEvent.date_time > now).order_by(ForumEvent.date_time.asc())
     res = await db.execute(stmt)
-    return res.scalars().all()
+    return [ForumEventResult.model_validate(row._mapping) for row in res]
+
+async def get_active_user_updates(db: AsyncConnection, start: datetime, end: datetime, limit: int = 1000) -> List[UserUpdateResult]:
+    """ updates whose [start, end) overlaps [start, end): served by the ix_user_updates_period GiST index """
+    window = func.tstzrange(literal(start, DateTime(timezone=True)), literal(end, DateTime(timezone=True)))
+    stmt = (
+        select(*_columns(UserUpdate))
+        .where(USER_UPDATE_PERIOD.op("&&")(window))
+        .order_by(UserUpdate.start_date_time, UserUpdate.id)
+        .limit(limit)
+    )
+    res = await db.execute(stmt)
+    return [UserUpdateResult.model_validate(row._mapping) for row in res]
+
+# Feed cursor: "<date_time as epoch microseconds>.<id>" of the last row sent. Plain digits, so it
+# needs no URL escaping (an ISO timestamp's "+00:00" would).
+def _feed_cursor(date_time: datetime, id: int) -> str:
+    delta = date_time - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return f"{delta // timedelta(microseconds=1)}.{id}"
+
+FEED_MAX_ID = 2**31 - 1   # messages.id is an int4
+
+def _parse_feed_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        micros, id = cursor.split(".", 1)
+        date_time, id = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=int(micros)), int(id)
+    except (ValueError, OverflowError):   # OverflowError: outside datetime's year 1..9999
+        raise SystemError(400, "Bad 'before' cursor")
+    if not 1 <= id <= FEED_MAX_ID:
+        raise SystemError(400, "Bad 'before' cursor")
+    return date_time, id
+
+async def get_message_feed(db: AsyncConnection, limit: int, before: Optional[str] = None) -> MessageFeedPage:
+    """ newest first, keyset on (date_time, id) with the author's name joined in: one index range scan per page """
+    stmt = (
+        select(*_columns(Message), User.name.label("author_name"))
+        .join(User, User.t_name == Message.user_t_name)
+        .order_by(Message.date_time.desc(), Message.id.desc())
+        .limit(limit + 1)
+    )
+    if before:
+        date_time, id = _parse_feed_cursor(before)
+        stmt = stmt.where(tuple_(Message.date_time, Message.id) < tuple_(literal(date_time, DateTime(timezone=True)), id))
+
+    rows = (await db.execute(stmt)).all()
+    items = [MessageFeedItem.model_validate(row._mapping) for row in rows[:limit]]
+    next_before = _feed_cursor(items[-1].date_time, items[-1].id) if len(rows) > limit else None
+    return MessageFeedPage(items=items, next_before=next_before)
 
 LOCAL_TZ = ZoneInfo("Asia/Jerusalem")
 def _week_key_sun_to_sat(dt: datetime) -> str:
@@ -39,7 +100,42 @@ def _week_key_sun_to_sat(dt: datetime) -> str:
     week_start = (local.date() - timedelta(days=days_since_sunday))
     return week_start.isoformat()
 
-async def get_future_forum_schedule(db, weeks: int = 54) -> List[ForumScheduleResult]:
+WEEK = timedelta(weeks=1)
+
+async def get_forum_events_between(db: AsyncSession, start: datetime, end: datetime) -> List[ForumEvent]:
+    stmt = (
+        select(ForumEvent)
+        .where(ForumEvent.date_time >= start, ForumEvent.date_time < end)
+        .order_by(ForumEvent.date_time.asc())
+    )
+    res = await db.execute(stmt)
+    return res.scalars().all()
+
+def _first_week_index(base_dt: datetime, start: datetime) -> int:
+    # index of the first weekly slot at or after start: ceil((start - base) / week)
+    if start <= base_dt:
+        return 0
+    return -((base_dt - start) // WEEK)
+
+def iter_forum_schedule(base_dt: datetime, minute_length: int, team_cycle: List[str], override_by_week: Dict[str, ForumEvent],
+                        start: datetime, end: Optional[datetime] = None) -> Iterator[ForumScheduleResult]:
+    """ lazily yields weekly forums from the first slot >= start, ordered by date (stops after end, if given) """
+    i = _first_week_index(base_dt, start)
+    while True:
+        generated_dt = base_dt + i * WEEK
+        if end is not None and generated_dt > end:
+            return
+
+        ov = override_by_week.get(_week_key_sun_to_sat(generated_dt))
+        if ov:
+            yield ForumScheduleResult(id=ov.id, name=ov.name, date_time=ov.date_time, team_name=ov.team_name, minute_length=minute_length, source="override")
+        else:
+            team_name = team_cycle[i % len(team_cycle)]
+            yield ForumScheduleResult(id=None, name="Forum", date_time=generated_dt, team_name=team_name, minute_length=minute_length, source="generated")
+        i += 1
+
+async def get_future_forum_schedule(db, weeks: int = 54, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[ForumScheduleResult]:
+    """ the next `weeks` forums from start (default: now), optionally bounded by end """
     settings = await db.scalar(select(ForumSettings).order_by(ForumSettings.id.desc()).limit(1))
     if not settings:
         return []
@@ -50,7 +146,15 @@ async def get_future_forum_schedule(db, weeks: int = 54) -> List[ForumScheduleRe
     if not team_cycle:
         return []
 
-    overrides = await get_future_forum_events(db=db)
+    start = start or datetime.now(timezone.utc)
+    last_dt = base_dt + (_first_week_index(base_dt, start) + weeks - 1) * WEEK
+    if end is not None:
+        last_dt = min(last_dt, end)
+    if last_dt < start:
+        return []
+
+    # only the events that can fall in the requested weeks
+    overrides = await get_forum_events_between(db, start, last_dt + WEEK)
 
     override_by_week = {}
     for ev in overrides:
@@ -58,22 +162,136 @@ async def get_future_forum_schedule(db, weeks: int = 54) -> List[ForumScheduleRe
         if k not in override_by_week:
             override_by_week[k] = ev
 
-    now_utc = datetime.now(timezone.utc)
-    schedule = []
-    for i in range(weeks):
-        generated_dt = base_dt + timedelta(weeks=i)
+    return list(islice(iter_forum_schedule(base_dt, minute_length, team_cycle, override_by_week, start, end), weeks))
 
-        if generated_dt < now_utc:
-            continue
 
-        k = _week_key_sun_to_sat(generated_dt)
-        ov = override_by_week.get(k)
+# The schedule only changes when forum_settings, teams (order) or forum_events change, so an
+# entry is kept while those tables' change versions (src/services/versions.py) stay the same.
+# Entries also expire when their first forum starts (it would no longer be "future").
+SCHEDULE_CACHE_TTL_SECONDS = int(os.getenv("SCHEDULE_CACHE_TTL_SECONDS", "3600"))
+SCHEDULE_TABLES = ("forum_settings", "teams", "forum_events")
+_schedule_cache: Dict[int, Tuple[List[ForumScheduleResult], str, datetime, Tuple[int, ...]]] = {}  # weeks -> (schedule, etag, valid_until, versions)
 
-        if ov:
-            schedule.append(ForumScheduleResult(id=ov.id, name=ov.name, date_time=ov.date_time, team_name=ov.team_name, minute_length=minute_length, source="override"))
-        else:
-            team_name = team_cycle[i % len(team_cycle)]
-            schedule.append(ForumScheduleResult(id=None, name="Forum", date_time=generated_dt, team_name=team_name, minute_length=minute_length, source="generated"))
+async def get_cached_forum_schedule(db, weeks: int = 54) -> Tuple[List[ForumScheduleResult], str]:
+    now = datetime.now(timezone.utc)
+    await load_versions(db)   # one tiny query instead of rebuilding the schedule; also sees other workers' writes
+    versions = versions_of(SCHEDULE_TABLES)
+    hit = _schedule_cache.get(weeks)
+    if hit and hit[2] > now and hit[3] == versions:
+        return hit[0], hit[1]
+
+    schedule = await get_future_forum_schedule(db, weeks)
+    etag = schedule_etag(schedule)
+
+    valid_until = now + timedelta(seconds=SCHEDULE_CACHE_TTL_SECONDS)
+    if schedule:
+        valid_until = min(valid_until, schedule[0].date_time)
+    # keyed by the versions read before the query: a write that lands meanwhile bumps them and the entry is never hit
+    _schedule_cache[weeks] = (schedule, etag, valid_until, versions)
+    return schedule, etag
+
+def schedule_etag(schedule: List[ForumScheduleResult]) -> str:
+    return strong_etag(dumps([s.model_dump(mode="json") for s in schedule]))
+
+
+# Everything the team page shows, in one payload. Cached per team the same way as the schedule:
+# kept while the versions of the tables it reads stay the same, and until its first upcoming slot starts.
+DASHBOARD_TABLES = ("teams", "team_links", "forum_ideas", "users", "forum_events", "forum_settings")
+DASHBOARD_CACHE_MAX_TEAMS = 256
+_dashboard_cache: Dict[str, Tuple[bytes, str, datetime, Tuple[int, ...]]] = {}  # team -> (body, etag, valid_until, versions)
+
+async def get_team_dashboard(db: AsyncSession, name: str) -> Tuple[bytes, str]:
+    """ (JSON body, ETag) """
+    now = datetime.now(timezone.utc)
+    await load_versions(db)
+    versions = versions_of(DASHBOARD_TABLES)
+    hit = _dashboard_cache.get(name)
+    if hit and hit[2] > now and hit[3] == versions:
+        return hit[0], hit[1]
+
+    stmt = (
+        select(Team)
+        .where(Team.name == name)
+        .options(
+            selectinload(Team.links),
+            selectinload(Team.forum_ideas),
+            selectinload(Team.users),
+            selectinload(Team.forum_events.and_(ForumEvent.date_time > now)),
+        )
+    )
+    team = (await db.execute(stmt)).scalar_one_or_none()
+    if team is None:
+        raise SystemError(404, "Team not found")
+    schedule, _ = await get_cached_forum_schedule(db)
+
+    dashboard = TeamDashboardResult(
+        name=team.name,
+        description=team.description,
+        order=team.order,
+        links=sorted(team.links, key=lambda l: l.id),
+        forum_ideas=sorted(team.forum_ideas, key=lambda i: i.id, reverse=True),
+        members=sorted(team.users, key=lambda u: u.name),
+        forum_events=sorted(team.forum_events, key=lambda e: e.date_time),
+        forum_slots=[s for s in schedule if s.team_name == name],
+    )
+    body = dashboard.model_dump_json().encode("utf-8")
+    etag = strong_etag(body)
+
+    valid_until = now + timedelta(seconds=SCHEDULE_CACHE_TTL_SECONDS)
+    for upcoming in (dashboard.forum_events, dashboard.forum_slots):
+        if upcoming:
+            valid_until = min(valid_until, upcoming[0].date_time)
+    if len(_dashboard_cache) >= DASHBOARD_CACHE_MAX_TEAMS:
+        _dashboard_cache.clear()
+    _dashboard_cache[name] = (body, etag, valid_until, versions)
+    return body, etag
+
+
+UPCOMING_MAX_ROWS = 200
+
+def _mmdd(d: date) -> int:
+    return d.month * 100 + d.day
+
+def _next_birthday(birthday: date, today: date) -> date:
+    for year in (today.year, today.year + 1):
+        try:
+            day = birthday.replace(year=year)
+        except ValueError:   # Feb 29 outside a leap year
+            day = date(year, 2, 28)
+        if day >= today:
+            return day
+    return day
+
+async def get_upcoming_dates(db: AsyncConnection, days: int, today: Optional[date] = None) -> UpcomingDatesResult:
+    """ birthdays and releases from today through today + days (portal-local dates), soonest first """
+    today = today or datetime.now(LOCAL_TZ).date()
+    end = today + timedelta(days=days)
+
+    start_mmdd, end_mmdd = _mmdd(today), _mmdd(end)
+    if end_mmdd == 228 and not calendar.isleap(end.year):
+        end_mmdd = 229   # Feb 29 birthdays fall on Feb 28 this year (_next_birthday)
+    if days >= 365:
+        window = BIRTHDAY_MMDD.is_not(None)
+    elif start_mmdd <= end_mmdd:
+        window = BIRTHDAY_MMDD.between(start_mmdd, end_mmdd)
+    else:   # wraps past Dec 31: two ranges on the same index
+        window = or_(BIRTHDAY_MMDD >= start_mmdd, BIRTHDAY_MMDD <= end_mmdd)
+    res = await db.execute(select(User.t_name, User.name, User.team_name, User.birthday).where(window))
+    birthdays = []
+    for t_name, name, team_name, birthday in res:
+        day = _next_birthday(birthday, today)
+        birthdays.append(UpcomingDateResult(t_name=t_name, name=name, team_name=team_name, date=day, days_until=(day - today).days))
+    birthdays.sort(key=lambda b: (b.date, b.name))
 
-    schedule.sort(key=lambda x: x.date_time)
-    return schedule
\ No newline at end of file
+    res = await db.execute(
+        select(User.t_name, User.name, User.team_name, User.release_date)
+        .where(User.release_date.between(today, end))
+        .order_by(User.release_date, User.name)
+        .limit(UPCOMING_MAX_ROWS + 1)   # one extra row tells us the list was cut
+    )
+    releases = [
+        UpcomingDateResult(t_name=t_name, name=name, team_name=team_name, date=release, days_until=(release - today).days)
+        for t_name, name, team_name, release in res
+    ]
+    truncated = len(birthdays) > UPCOMING_MAX_ROWS or len(releases) > UPCOMING_MAX_ROWS
+    return UpcomingDatesResult(birthdays=birthdays[:UPCOMING_MAX_ROWS], releases=releases[:UPCOMING_MAX_ROWS], truncated=truncated)
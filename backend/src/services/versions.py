@@ -0,0 +1,28 @@
+# src/services/versions.py
+# Per-table change counters. The DB copy (table_versions) is bumped by a trigger on every write
+# statement, whoever issues it (cascades included); this module keeps an in-process mirror of it.
+# Caches store the versions they were computed at and compare them with the mirror, and every
+# cached read calls load_versions first: the mirror only ever holds values read from the DB.
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.entities.table_version import TableVersion
+
+_versions: Dict[str, int] = {}
+
+
+async def load_versions(db: AsyncSession | AsyncConnection) -> Dict[str, int]:
+    """ one tiny query; the mirror takes the DB values as they are, whoever wrote """
+    res = await db.execute(select(TableVersion.table_name, TableVersion.version))
+    _versions.update(res.all())
+    return dict(_versions)
+
+def local_versions() -> Dict[str, int]:
+    return dict(_versions)
+
+def versions_of(tables: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(_versions.get(t, 0) for t in tables)
@@ -10,6 +10,14 @@ export type AdminRowsResult = {
   primary_keys: string[];
 };
 
+// columnar list format: values by column position instead of repeating every key per row
+type AdminColumnsResult = {
+  rows: any[][];
+  columns: string[];
+  primary_keys: string[];
+  next_after: string | null;
+};
+
 function enc(v: any) {
   return encodeURIComponent(String(v));
 }
@@ -38,8 +46,18 @@ export async function getAdminEntities(): Promise<string[]> {
 }
 
 export async function getAdminRows(entity: string): Promise<AdminRowsResult> {
-  const res = await http.get<AdminRowsResult>(pathFor(entity));
-  return res.data;
+  // the server sends a page at a time; follow next_after until the last one
+  const rows: any[][] = [];
+  let after: string | null = null;
+  let page: AdminColumnsResult;
+  do {
+    page = (await http.get<AdminColumnsResult>(pathFor(entity), { params: { format: "columns", after: after ?? undefined } })).data;
+    rows.push(...page.rows);
+    after = page.next_after;
+  } while (after);
+  const { columns, primary_keys } = page;
+  const items = rows.map((r) => Object.fromEntries(columns.map((c, i) => [c, r[i]])));
+  return { items, columns, primary_keys };
 }
 
 export async function createAdminRow(entity: string, payload: Row) {
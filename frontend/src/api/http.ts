@@ -15,18 +15,118 @@ http.interceptors.request.use((config) => {
   return config;
 });
 
+// generic list endpoints return one page at a time ({items, next_after}); this follows next_after to the end
+export type ListPage<T> = {
+  items: T[];
+  next_after: string | null;
+};
+
+export async function getAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  let after: string | null = null;
+  do {
+    const res: { data: ListPage<T> } = await http.get<ListPage<T>>(path, { params: { after: after ?? undefined } });
+    items.push(...res.data.items);
+    after = res.data.next_after;
+  } while (after);
+  return items;
+}
 
 export type Message = {
   id: number;
   title: string;
   message: string;
   user_t_name: string;
+  author_name?: string;   // set by the feed; rows pushed over the stream only have user_t_name
   date_time: string;
 };
 
+export type MessageFeedPage = {
+  items: Message[];
+  next_before: string | null;
+};
+
 export async function getMessages(): Promise<Message[]> {
-  const res = await http.get("/messages");
-  return res.data.items;
+  return getAllPages<Message>("/messages");
+}
+
+// newest first; pass the previous page's next_before to get the older page after it
+export async function getMessageFeed(before?: string | null, limit = 50): Promise<MessageFeedPage> {
+  const res = await http.get<MessageFeedPage>("/messages/feed", { params: { limit, before: before ?? undefined } });
+  return res.data;
+}
+
+export type SearchHit = {
+  kind: "messages" | "forum_ideas";
+  id: number;
+  rank: number;
+  title: string | null;         // messages only
+  snippet: string;              // matches wrapped in \uE000 ... \uE001, see highlightParts
+  user_t_name: string;
+  date_time: string | null;     // messages only
+  team_name: string | null;     // forum ideas only
+};
+
+export type SearchPage = {
+  query: string;
+  items: SearchHit[];
+  next_offset: number | null;
+};
+
+export async function searchPortal(q: string, kind: "all" | SearchHit["kind"] = "all", offset = 0): Promise<SearchPage> {
+  const res = await http.get<SearchPage>("/search", { params: { q, kind, offset } });
+  return res.data;
+}
+
+export type ChangeEvent<T> = {
+  table: string;
+  op: "INSERT" | "UPDATE" | "DELETE" | "RESYNC";
+  row: T;
+  truncated?: boolean;
+};
+
+// live row changes pushed by the server (GET /api/stream); returns a function that closes the stream
+export function subscribeChanges<T>(tables: string[], onChange: (e: ChangeEvent<T>) => void): () => void {
+  // EventSource can't set an Authorization header: admin-only tables (user_updates) need a short-lived
+  // ticket in the URL instead of the access token. Tickets expire, so a refused (re)connect gets a new one.
+  let es: EventSource | null = null;
+  let closed = false;
+  let retry: ReturnType<typeof setTimeout> | undefined;
+
+  async function open() {
+    const params = new URLSearchParams({ tables: tables.join(",") });
+    if (localStorage.getItem("access_token")) {
+      try {
+        params.set("ticket", (await http.get<{ ticket: string }>("/stream/ticket")).data.ticket);
+      } catch {
+        // public tables still stream without one; admin-only ones are refused and retried below
+      }
+    }
+    if (closed) return;
+    es = new EventSource(`/api/stream?${params}`);
+    es.addEventListener("change", (e) => onChange(JSON.parse((e as MessageEvent).data)));
+    es.onerror = () => {
+      // CONNECTING: the browser retries by itself; CLOSED: it gave up (e.g. 403 on an expired ticket)
+      if (es?.readyState === EventSource.CLOSED && !closed) retry = setTimeout(open, 3000);
+    };
+  }
+
+  open();
+  return () => {
+    closed = true;
+    clearTimeout(retry);
+    es?.close();
+  };
+}
+
+// true when the event can't be applied locally (missed events / row too big to send): reload the list
+export function needsReload(e: ChangeEvent<unknown>): boolean {
+  return e.op === "RESYNC" || !!e.truncated;
+}
+
+export function applyChange<T extends { id: number }>(rows: T[], e: ChangeEvent<T>): T[] {
+  const without = rows.filter((r) => r.id !== e.row.id);
+  return e.op === "DELETE" ? without : [e.row, ...without];
 }
 
 export async function postMessage(title: string, message: string, user_t_name: string): Promise<Message> {
@@ -44,8 +144,26 @@ export type User = {
 };
 
 export async function getUsers(): Promise<User[]> {
-  const res = await http.get("/users");
-  return res.data.items;
+  return getAllPages<User>("/users");
+}
+
+export type UpcomingDate = {
+  t_name: string;
+  name: string;
+  team_name: string | null;
+  date: string;          // next birthday / the release date
+  days_until: number;
+};
+
+export type UpcomingDates = {
+  birthdays: UpcomingDate[];
+  releases: UpcomingDate[];
+  truncated: boolean;    // the server cut a list (it sends at most 200 of each)
+};
+
+export async function getUpcomingDates(days = 30): Promise<UpcomingDates> {
+  const res = await http.get<UpcomingDates>("/users/upcoming", { params: { days } });
+  return res.data;
 }
 
 export type UserUpdate = {
@@ -57,8 +175,7 @@ export type UserUpdate = {
 };
 
 export async function getUserUpdates(): Promise<UserUpdate[]> {
-  const res = await http.get("/user_updates");
-  return res.data.items;
+  return getAllPages<UserUpdate>("/user_updates");
 }
 
 export async function postUserUpdate(update: string, user_t_name: string, start_date_time: string, end_date_time: string): Promise<UserUpdate> {
@@ -71,8 +188,7 @@ export type Team = {
 };
 
 export async function getTeams(): Promise<Team[]> {
-  const res = await http.get(`/teams`);
-  return res.data.items;
+  return getAllPages<Team>(`/teams`);
 }
 
 export type TeamLink = {
@@ -104,6 +220,12 @@ export async function getTeamForumIdeas(team_name: string): Promise<ForumIdea[]>
   return res.data;
 }
 
+export type TeamMember = {
+  t_name: string;
+  name: string;
+  release_date: string | null;
+};
+
 export type ForumScheduleItem = {
   id: number | null;
   name: string;
@@ -130,6 +252,30 @@ export async function getFutureForumEvents() {
   return res.data;
 }
 
+// one request for the whole team page: links, ideas, members, upcoming events and forum slots
+export type TeamDashboard = {
+  name: string;
+  description: string | null;
+  order: number;
+  links: TeamLink[];
+  forum_ideas: ForumIdea[];
+  members: TeamMember[];
+  forum_events: ForumEvent[];
+  forum_slots: ForumScheduleItem[];
+};
+
+export async function getTeamDashboard(team_name: string): Promise<TeamDashboard> {
+  const res = await http.get<TeamDashboard>(`/teams/${team_name}/dashboard`);
+  return res.data;
+}
+
+// iCalendar feed URL for calendar apps: signed for its scope, since calendar apps can't log in.
+// No scope = the caller's own feed; team / all are for admins.
+export async function getCalendarLink(scope: { team?: string; all?: boolean } = {}): Promise<string> {
+  const res = await http.get<{ url: string }>("/calendar/link", { params: scope });
+  return `${window.location.origin}${res.data.url}`;
+}
+
 export type UserEvent = {
   id: number;
   username: string;
@@ -152,8 +298,7 @@ export type CleaningDutyCreate = Omit<CleaningDuty, "id">;
 export type CleaningDutyUpdate = Partial<CleaningDutyCreate>;
 
 export async function get_cleaning_duties(): Promise<CleaningDuty[]> {
-  const res = await http.get("/cleaning_duties");
-  return res.data.items;
+  return getAllPages<CleaningDuty>("/cleaning_duties");
 }
 
 export async function create_cleaning_duty(payload: CleaningDutyCreate): Promise<CleaningDuty> {
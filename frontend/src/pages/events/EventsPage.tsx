@@ -8,6 +8,7 @@ import { useAsync } from "../components/handlers";
 import { getUsers } from "../../api/http";
 import type { User } from "../../api/http";
 import { get_sorted_birthday, get_sorted_releases, EventsPanel } from "./EventsPanels";
+import { UpcomingPanel } from "./UpcomingPanel";
 
 
 export default function EventsPage() {
@@ -20,6 +21,8 @@ export default function EventsPage() {
 
   return (
     <PortalShell title="Events" subtitle="Birthdays & releases">
+      <UpcomingPanel />
+
       {loading && <Loader />}
       {err && <Text c="red">Failed to load users</Text>}
 
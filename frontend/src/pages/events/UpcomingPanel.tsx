@@ -0,0 +1,59 @@
+import {
+  Card,
+  Text,
+  Stack,
+  Group,
+  Badge,
+  Divider,
+  Loader,
+} from "@mantine/core";
+import { useAsync } from "../components/handlers";
+import { getUpcomingDates } from "../../api/http";
+import type { UpcomingDate, UpcomingDates } from "../../api/http";
+import { convert_iso_to_Date, set_date_IL } from "../../utils/dates_utils";
+
+const UPCOMING_DAYS = 30;
+
+type UpcomingRow = UpcomingDate & { kind: "Birthday" | "Release" };
+
+
+// what's coming up soon; the full lists stay in the panels below
+export function UpcomingPanel() {
+  const { data, loading, err } = useAsync<UpcomingDates>(() => getUpcomingDates(UPCOMING_DAYS), []);
+  const rows: UpcomingRow[] = [
+    ...(data?.birthdays ?? []).map((r) => ({ ...r, kind: "Birthday" as const })),
+    ...(data?.releases ?? []).map((r) => ({ ...r, kind: "Release" as const })),
+  ].sort((a, b) => a.days_until - b.days_until);
+
+  return (
+    <Card withBorder radius="md" p="lg" mb="md">
+      <Group justify="space-between" mb="xs">
+        <Text fw={700} size="lg">
+          Upcoming
+        </Text>
+        <Badge variant="light">Next {UPCOMING_DAYS} days</Badge>
+      </Group>
+
+      <Divider my="sm" />
+
+      {loading && <Loader size="sm" />}
+      {err && <Text c="red">Failed to load upcoming dates</Text>}
+
+      <Stack gap="xs">
+        {rows.map((row) => (
+          <Group key={`${row.kind}-${row.t_name}`} justify="space-between">
+            <Text>
+              <Text span fw={700}>{row.name}</Text> · {row.kind}
+            </Text>
+            <Text size="sm" c="dimmed">
+              {set_date_IL(convert_iso_to_Date(row.date)!)} · {row.days_until === 0 ? "today" : `in ${row.days_until} days`}
+            </Text>
+          </Group>
+        ))}
+
+        {data && rows.length === 0 && <Text c="dimmed">Nothing in the next {UPCOMING_DAYS} days</Text>}
+        {data?.truncated && <Text size="sm" c="orange">Only the soonest ones are shown; see the full lists below</Text>}
+      </Stack>
+    </Card>
+  );
+}
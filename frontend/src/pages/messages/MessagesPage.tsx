@@ -11,9 +11,9 @@ import {
 } from "@mantine/core";
 import PortalShell from "../components/PortalShell";
 import { useAsync } from "../components/handlers";
-import { getMessages, postMessage } from "../../api/http";
-import type { Message } from "../../api/http";
-import { extractErrorMessage } from "../../utils/utils";
+import { getMessageFeed, postMessage, subscribeChanges, applyChange, needsReload, searchPortal } from "../../api/http";
+import type { Message, MessageFeedPage, SearchPage } from "../../api/http";
+import { extractErrorMessage, highlightParts } from "../../utils/utils";
 import { useAuth } from "../../utils/AuthContext";
 
 type NewMessage = {
@@ -28,10 +28,24 @@ export default function MessagesPage() {
   const [draft, setDraft] = useState<NewMessage>({ title: "", message: "" });                              // draft row created/edited (object textInputs read/write)
   const [sending, setSending] = useState(false);
   const [sendErr, setSendErr] = useState<string | null>(null);
-  const { data, loading, err } = useAsync<Message[]>(getMessages, []);
+  const { data, loading, err, reload } = useAsync<MessageFeedPage>(() => getMessageFeed(), []);
   const [messages, setMessages] = useState<Message[]>([]);
-  
-  useEffect(() => { if (data) setMessages(data); }, [data]);
+  const [nextBefore, setNextBefore] = useState<string | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  const [query, setQuery] = useState("");
+  const [results, setResults] = useState<SearchPage | null>(null);
+  const [searching, setSearching] = useState(false);
+
+  useEffect(() => {
+    if (data) {
+      setMessages(data.items);
+      setNextBefore(data.next_before);
+    }
+  }, [data]);
+  useEffect(() => subscribeChanges<Message>(["messages"], (e) => {
+    if (needsReload(e)) reload();
+    else setMessages((prev) => applyChange(prev, e));
+  }), [reload]);
 
   const canSend = draft.title.trim() && draft.message.trim();
 
@@ -53,6 +67,32 @@ export default function MessagesPage() {
       setSending(false);
     }
   }
+  async function loadOlder() {
+    if (!nextBefore) return;
+    setLoadingOlder(true);
+    try {
+      const page = await getMessageFeed(nextBefore);
+      setMessages((prev) => {
+        const seen = new Set(prev.map((m) => m.id));
+        return [...prev, ...page.items.filter((m) => !seen.has(m.id))];
+      });
+      setNextBefore(page.next_before);
+    } finally {
+      setLoadingOlder(false);
+    }
+  }
+  async function runSearch() {
+    if (!query.trim()) {
+      setResults(null);
+      return;
+    }
+    setSearching(true);
+    try {
+      setResults(await searchPortal(query, "messages"));
+    } finally {
+      setSearching(false);
+    }
+  }
   function newMessageForm() {
     setNewMode(true);
     setDraft({ title: "", message: "" });
@@ -71,8 +111,44 @@ export default function MessagesPage() {
         <Button variant="light" onClick={newMessageForm}>
           New Message
         </Button>
+        <TextInput
+          value={query}
+          placeholder="Search messages"
+          onChange={(e) => {
+            const value = e.currentTarget.value;
+            setQuery(value);
+            if (!value.trim()) setResults(null);
+          }}
+          onKeyDown={(e) => { if (e.key === "Enter") runSearch(); }}
+          size="xs"
+        />
+        <Button variant="subtle" onClick={runSearch} loading={searching}>
+          Search
+        </Button>
       </Group>
 
+      {results && (
+        <Stack gap="md" mb="md">
+          {results.items.map((hit) => (
+            <Card key={hit.id} withBorder radius="md" p="lg">
+              <Group justify="space-between" mb="xs">
+                <Text fw={700} size="lg">
+                  {highlightParts(hit.title ?? "").map((p, i) => p.match ? <mark key={i}>{p.text}</mark> : p.text)}
+                </Text>
+                {hit.date_time && (
+                  <Badge variant="light">{new Date(hit.date_time).toLocaleString()}</Badge>
+                )}
+              </Group>
+              <Text mb="sm">
+                {highlightParts(hit.snippet).map((p, i) => p.match ? <mark key={i}>{p.text}</mark> : p.text)}
+              </Text>
+              <Text size="sm" c="dimmed">Posted by {hit.user_t_name}</Text>
+            </Card>
+          ))}
+          {results.items.length === 0 && <Text c="dimmed">No messages match "{results.query}"</Text>}
+        </Stack>
+      )}
+
       <Stack gap="md">
         {newMode && (
           <Card withBorder radius="md" p="lg" >
@@ -125,11 +201,19 @@ export default function MessagesPage() {
             <Text mb="sm">{msg.message}</Text>
 
             <Text size="sm" c="dimmed">
-              Posted by {msg.user_t_name}
+              Posted by {msg.author_name ?? msg.user_t_name}
             </Text>
           </Card>
         ))}
 
+        {nextBefore && (
+          <Group justify="center">
+            <Button variant="subtle" onClick={loadOlder} loading={loadingOlder}>
+              Load older messages
+            </Button>
+          </Group>
+        )}
+
         {messages.length === 0 && (
           <Text c="dimmed">No messages yet</Text>
         )}
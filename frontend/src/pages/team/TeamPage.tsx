@@ -2,8 +2,8 @@
 import { useParams } from "react-router-dom";
 import { Text, Loader, Card, Group, Button, TextInput, Stack, Anchor } from "@mantine/core";
 import { useAsync } from "../components/handlers";
-import { getTeamsLinks, postLink } from "../../api/http";
-import type { TeamLink } from "../../api/http";
+import { getCalendarLink, getTeamDashboard, postLink } from "../../api/http";
+import type { TeamDashboard, TeamLink } from "../../api/http";
 import PortalShell from "../components/PortalShell";
 import { useEffect, useState } from "react";
 import { useAuth } from "../../utils/AuthContext";
@@ -24,13 +24,13 @@ export default function TeamPage() {
   const [draft, setDraft] = useState<NewLink>({ link: "", name: "" });  // draft row created/edited (object textInputs read/write)
   const [uploading, setUploading] = useState(false);
   const [uploadErr, setUploadErr] = useState<string | null>(null);
-  const { data, loading, err } = useAsync<TeamLink[]>(
-    () => getTeamsLinks(teamName),
+  const { data, loading, err } = useAsync<TeamDashboard>(
+    () => getTeamDashboard(teamName),
     [teamName]
   );
   const [team_links, setLinks] = useState<TeamLink[]>([]);
 
-  useEffect(() => { if (data) setLinks(data); }, [data]);
+  useEffect(() => { if (data) setLinks(data.links); }, [data]);
 
   const canUpload = draft.link.trim() && draft.name.trim();
 
@@ -70,6 +70,9 @@ export default function TeamPage() {
         <Button variant="light" onClick={newLinkForm}>
           Add Link
         </Button>
+        <Button variant="subtle" onClick={async () => { window.location.href = await getCalendarLink({ team: teamName }); }}>
+          Subscribe to team calendar
+        </Button>
       </Group>
 
       <Stack gap="md">
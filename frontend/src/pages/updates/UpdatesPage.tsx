@@ -2,7 +2,7 @@ import { useEffect, useState } from "react";
 import { Text, Loader, Group, Button, SimpleGrid, Card, TextInput, Stack } from "@mantine/core";
 import PortalShell from "../components/PortalShell";
 import { useAsync } from "../components/handlers";
-import { getUserUpdates, postUserUpdate } from "../../api/http";
+import { getUserUpdates, postUserUpdate, subscribeChanges, applyChange, needsReload } from "../../api/http";
 import type { UserUpdate } from "../../api/http";
 import { get_row_dates, UpdatesPanel, closest_upcoming_updates, recent_ended_updates } from "./UpdatesPanels";
 import type { UpdateRow } from "./UpdatesPanels";
@@ -23,10 +23,14 @@ export default function UpdatesPage() {
   const [draft, setDraft] = useState<NewUpdate>({ user_t_name: "", update: "", start_date_time: "", end_date_time: "" });                              // draft row created/edited (object textInputs read/write)
   const [updating, setUpdating] = useState(false);
   const [updateErr, setUpdateErr] = useState<string | null>(null);
-  const { data, loading, err } = useAsync<UserUpdate[]>(getUserUpdates, []);
+  const { data, loading, err, reload } = useAsync<UserUpdate[]>(getUserUpdates, []);
   const [updates, setUpdates] = useState<UserUpdate[]>([]);
 
   useEffect(() => { if (data) setUpdates(data); }, [data]);
+  useEffect(() => subscribeChanges<UserUpdate>(["user_updates"], (e) => {
+    if (needsReload(e)) reload();
+    else setUpdates((prev) => applyChange(prev, e));
+  }), [reload]);
 
   const canSend = draft.update.trim() && draft.start_date_time.trim() && draft.end_date_time.trim();
 
@@ -47,3 +47,11 @@ export function mapRowForEdit(row: Record<string, any>) {
   for (const [k, v] of Object.entries(row)) out[k] = convert_iso_to_datetime(v);
   return out;
 }
+
+
+// search snippets mark matches with U+E000 ... U+E001; render the parts with match=true in <mark>
+export function highlightParts(s: string): { text: string; match: boolean }[] {
+  return s.split(/(\uE000[^\uE001]*\uE001)/).filter(Boolean).map((part) =>
+    part.startsWith("\uE000") ? { text: part.slice(1, -1), match: true } : { text: part, match: false }
+  );
+}